@@ -0,0 +1,250 @@
+"""Headless per-section benchmark of a dashboard rerun.
+
+    python benchmarks/bench_dashboard.py --scales small medium --out bench.json
+
+Every section of dashboard.py and pages/logistic.py is timed on synthetic
+data at each scale (median wall time, peak traced allocation, blocks and
+bytes still held when the section returns, payload bytes sent to the
+browser), then the pages are run end to end through Streamlit's
+AppTest against a dataset of the same scale. Output is sorted JSON on stdout
+(Streamlit's log lines go to stderr), so two runs can be diffed directly.
+"""
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import altair as alt
+import pyarrow as pa
+import pydeck as pdk
+import streamlit as st
+
+import synthetic
+from dashboard import get_line_chart
+from datasource import SQLiteDataSource, SyntheticDataSource, load_dashboard_data, load_lots
+from echarts_options import pie_options
+from heatmap import heatmap_option
+from lot_grid import LotIndex
+from routes import viewport_bbox
+from simplify import LOD_ZOOMS, pick_lod, zoom_tolerance
+
+## sites, zones, slots per zone, hourly readings per site, routes
+SCALES = {
+    "small": dict(sites=3, zones=5, slots=6, readings=31 * 24, routes=9),
+    "medium": dict(sites=12, zones=20, slots=50, readings=366 * 24, routes=1000),
+    "large": dict(sites=50, zones=40, slots=250, readings=3 * 366 * 24, routes=10000),
+}
+
+
+def arrow_bytes(data):
+    table = pa.Table.from_pandas(data)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def altair_bytes(chart):
+    # like st.altair_chart: each distinct dataset is sent once as Arrow and
+    # the spec only refers to it by name
+    datasets = {}
+
+    def by_name(data):
+        raw = arrow_bytes(data)
+        name = hashlib.md5(raw).hexdigest()
+        datasets[name] = raw
+        return {"name": name}
+
+    alt.data_transformers.register("bench_arrow", by_name)
+    with alt.data_transformers.enable("bench_arrow"):
+        spec = chart.to_dict()
+    return len(json.dumps(spec).encode("utf-8")) + sum(len(raw) for raw in datasets.values())
+
+
+def payload_bytes(payload):
+    if payload is None:
+        return 0
+    if isinstance(payload, alt.TopLevelMixin):
+        return altair_bytes(payload)
+    if hasattr(payload, "to_json"):
+        payload = payload.to_json()
+    if not isinstance(payload, str):
+        payload = json.dumps(payload, default=str)
+    return len(payload.encode("utf-8"))
+
+
+def quiet(fn):
+    # for sections that only compute: no payload reaches the browser, but the
+    # result is kept on the wrapper so measure still counts what it retains
+    def run():
+        run.result = fn()
+    return run
+
+
+def measure(fn, repeat):
+    # median seconds over repeat runs, then one traced run for allocations:
+    # peak_alloc_bytes is the most memory held at once during the call, and
+    # retained_blocks / retained_bytes are what the call allocated and still
+    # held when it returned, its result included (tracemalloc can't count
+    # blocks that were freed again before the call returned);
+    # fn returns the payload that section sends to the browser (or None)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    traced = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    stats = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]).statistics("filename")
+    tracemalloc.stop()
+    del traced
+    vars(fn).pop("result", None)
+    return {
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "peak_alloc_bytes": peak,
+        "retained_blocks": sum(stat.count for stat in stats),
+        "retained_bytes": sum(stat.size for stat in stats),
+        "payload_bytes": payload_bytes(result),
+    }
+
+
+def bench_sections(scale, repeat):
+    sites = synthetic.site_names(scale["sites"])
+    site = sites[0]
+    history = synthetic.history_store(sites, scale["readings"])
+    history.build_rollups()
+    end = history.partitions[site]["date"][-1]
+    month = end - 30 * 24 * 3600 * 10 ** 9
+    year = end - 365 * 24 * 3600 * 10 ** 9
+
+    source = SyntheticDataSource(scale["zones"], scale["slots"])
+    date = synthetic.pd.Timestamp(end).date()
+    data = load_dashboard_data(source, site, date)
+    grid = load_lots(source, site)
+    grids = {s: load_lots(source, s) for s in sites[:3]}
+    index = LotIndex(grids)
+    rows = list(range(min(5, len(grid))))
+
+    routes = synthetic.route_store(scale["routes"])
+    lods = {zoom: routes.simplified(zoom_tolerance(zoom)) for zoom in LOD_ZOOMS}
+    view = viewport_bbox(23.5, 120.9, 6)
+
+    def deck(zoom):
+        frame = (pick_lod(lods, zoom) or routes).to_frame(routes.query_bbox(*view))
+        layer = pdk.Layer(type='PathLayer', data=frame, get_color='顏色', get_path='路徑', get_width=5)
+        return pdk.Deck(layers=[layer], initial_view_state=pdk.ViewState(latitude=23.5, longitude=120.9, zoom=zoom))
+
+    sections = {
+        "fetch_site_data": quiet(lambda: load_dashboard_data(source, site, date)),
+        "fetch_lots": quiet(lambda: load_lots(source, site)),
+        "history_query_month": quiet(lambda: history.query(site, "temperature", month, end)),
+        "history_query_year": quiet(lambda: history.query(site, "temperature", year, end)),
+        "line_chart_month": lambda: get_line_chart(history.query(site, "temperature", month, end), "date", "temperature", "month"),
+        "line_chart_year": lambda: get_line_chart(history.query(site, "temperature", year, end), "date", "temperature", "year"),
+        "pie_options": lambda: [pie_options("storage", tuple(data["storage"])),
+                                pie_options("inventory", tuple(data["inventory"]))],
+        "heatmap": lambda: heatmap_option(grid.qty_matrix(), grid.zones, grid.slots),
+        "lot_index_build": quiet(lambda: LotIndex(grids)),
+        "lot_search_prefix": quiet(lambda: index.search("W25", limit=50)),
+        "lot_trends": quiet(lambda: [grid.day_series(rows, date), grid.month_series(rows, date.year)]),
+        "daily_stats_all_sites": quiet(lambda: history.daily_stats("temperature", year, end)),
+        "route_viewport_query": quiet(lambda: routes.query_bbox(*view)),
+        "pydeck_zoom6": lambda: deck(6),
+        "pydeck_full_detail": lambda: deck(20),
+    }
+    return {name: measure(fn, repeat) for name, fn in sections.items()}
+
+
+def write_dataset(root, scale):
+    # the page-level inputs at this scale, in the formats the pages load;
+    # lots only for the first warehouses, which are the ones a page run opens
+    sites = synthetic.site_names(scale["sites"])
+    synthetic.history_store(sites, scale["readings"]).save(os.path.join(root, "history"))
+    routes = synthetic.route_store(scale["routes"])
+    routes.save(os.path.join(root, "routes"))
+    routes.save_lods(os.path.join(root, "routes"))
+    source = SyntheticDataSource(scale["zones"], scale["slots"])
+    SQLiteDataSource.from_source(os.path.join(root, "dashboard.db"), source, sites[:len(synthetic.BASE_SITES)],
+                                 [synthetic.pd.Timestamp.now().date()])
+    return {
+        "TS_DASHBOARD_HISTORY": os.path.join(root, "history"),
+        "TS_DASHBOARD_ROUTES": os.path.join(root, "routes"),
+        "TS_DASHBOARD_DB": os.path.join(root, "dashboard.db"),
+    }
+
+
+def bench_pages(scale, timeout):
+    # end-to-end script runs through AppTest on a dataset of this scale
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = write_dataset(tmp, scale)
+        os.environ.update(env)
+        # loaders are process-wide caches; without this a scale reuses the previous one's data
+        st.cache_resource.clear()
+        st.cache_data.clear()
+        cwd = os.getcwd()
+        os.chdir(ROOT)
+        try:
+            for page in ("dashboard.py", "pages/logistic.py", "pages/compare.py"):
+                at = AppTest.from_file(page, default_timeout=timeout)
+                start = time.perf_counter()
+                at.run()
+                first = time.perf_counter() - start
+                start = time.perf_counter()
+                at.run()
+                rerun = time.perf_counter() - start
+                results[page] = {
+                    "first_run_ms": round(first * 1000, 3),
+                    "rerun_ms": round(rerun * 1000, 3),
+                    "exceptions": [e.value for e in at.exception],
+                }
+        finally:
+            os.chdir(cwd)
+            for name in env:
+                os.environ.pop(name, None)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="+", default=["small", "medium"], choices=list(SCALES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-pages", action="store_true", help="skip the AppTest page runs")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Streamlit writes its log lines to stdout; point fd 1 at stderr so only the report lands there
+    sys.stdout.flush()
+    report_out = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+
+    report = {}
+    for name in args.scales:
+        report[name] = {"scale": SCALES[name], "sections": bench_sections(SCALES[name], args.repeat)}
+        if not args.no_pages:
+            report[name]["pages"] = bench_pages(SCALES[name], args.timeout)
+
+    text = json.dumps(report, indent=2, sort_keys=True, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        report_out.write(text + "\n")
+    report_out.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import functools
+import threading
+import streamlit as st
+
+from instrumentation import span
+
+## TTLs (seconds), matched to how often the source data changes
+REALTIME_TTL = 60        # IoT sensors report once a minute
+STATIC_TTL = None        # history and routes only change on redeploy
+
+## max entries per cache; realtime data is keyed by (site, date)
+REALTIME_MAX_ENTRIES = 256
+
+CACHE_STATS = {}
+_stats_lock = threading.Lock()    # sessions run on their own threads
+
+
+def cached(ttl=None, max_entries=None, copy=False):
+    # Bounded Streamlit cache with hit/miss counters.
+    # copy=False uses st.cache_resource: hits return the cached object itself
+    # without the pickle round-trip st.cache_data does, so callers must treat
+    # the result as read-only. copy=True uses st.cache_data for results that
+    # callers mutate.
+    def decorator(func):
+        stats = CACHE_STATS.setdefault(func.__qualname__, {"calls": 0, "misses": 0})
+
+        @functools.wraps(func)
+        def load(*args, **kwargs):
+            with _stats_lock:
+                stats["misses"] += 1
+            return func(*args, **kwargs)
+
+        cache = st.cache_data if copy else st.cache_resource
+        cached_load = cache(ttl=ttl, max_entries=max_entries, show_spinner=False)(load)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _stats_lock:
+                stats["calls"] += 1
+            with span(func.__qualname__):
+                return cached_load(*args, **kwargs)
+
+        wrapper.clear = cached_load.clear
+        return wrapper
+
+    return decorator
+
+
+def cache_stats():
+    with _stats_lock:
+        return {
+            name: {"hits": s["calls"] - s["misses"], "misses": s["misses"]}
+            for name, s in CACHE_STATS.items()
+        }
@@ -0,0 +1,356 @@
+import asyncio
+import os
+import streamlit as st
+from streamlit_echarts import st_echarts
+
+import numpy as np
+import pandas as pd
+import altair as alt
+import matplotlib.pyplot as plt
+from datetime import datetime
+
+from caching import cached, REALTIME_TTL, REALTIME_MAX_ENTRIES, STATIC_TTL
+from datasource import default_data_source, load_dashboard_data, load_lots
+from downsample import downsample
+from echarts_options import pie_options
+from heatmap import heatmap_option
+from history_store import HistoryStore
+from instrumentation import begin_run, end_run, fragment, span, timed
+from lot_grid import LotIndex
+from realtime import MetricFeed, metrics_panel
+import synthetic
+
+CHART_WIDTH_PX = 800
+HISTORY_HOURS = 366 * 24
+
+## env var pointing at a history/ directory written by synthetic.py (or any
+## HistoryStore.save); its sites become the warehouse list
+HISTORY_ENV = "TS_DASHBOARD_HISTORY"
+
+## site registry: url key -> warehouse name
+SITES = {
+    "taipei": "台北倉",
+    "taoyuan": "桃園倉",
+    "kaohsiung": "高雄倉",
+}
+
+def site_names():
+    return load_history_store().sites()
+
+def site_index(default_site=None):
+    # ?site=taoyuan (or ?site=<warehouse name>) in the url overrides the deployment default
+    key = st.query_params.get("site")
+    site = SITES.get(key, key or default_site)
+    names = site_names()
+    return names.index(site) if site in names else 0
+
+@timed("line_chart")
+def get_line_chart(data, x_axis, y_axis ,title=None, width=CHART_WIDTH_PX, method="lttb"):
+    # never send more points than the chart has pixels, and only the columns drawn
+    data = downsample(data, x_axis, y_axis, width, method)[["site", x_axis, y_axis]]
+    sites = list(data["site"].unique())
+    ## hover snaps to the nearest x only; the rule layer pivots to one row per
+    ## x, so the voronoi has one cell per date instead of one per site reading
+    hover = alt.selection_single(
+        encodings=["x"],
+        nearest=True,
+        on="mouseover",
+        empty="none",
+        clear="mouseout",
+    )
+    base = alt.Chart().encode(x=alt.X(f"{x_axis}:T", title=x_axis))
+    lines = base.mark_line().encode(
+        y=alt.Y(f"{y_axis}:Q", title=y_axis),
+        color="site:N",
+        strokeDash="site:N",
+    )
+    points = lines.mark_circle(size=65).transform_filter(hover)
+    tooltips = (
+        base.transform_pivot("site", value=y_axis, groupby=[x_axis])
+        .mark_rule()
+        .encode(
+            opacity=alt.condition(hover, alt.value(0.3), alt.value(0)),
+            tooltip=[alt.Tooltip(f"{x_axis}:T", title=x_axis)] + [alt.Tooltip(f"{site}:Q") for site in sites],
+        )
+        .add_selection(hover)
+    )
+    ## one dataset on the layer, referenced by all three marks
+    return alt.layer(lines, points, tooltips, data=data, title=title or "").interactive()
+
+def get_pie_chart(sizes, labels, colors):
+    fig, ax = plt.subplots()
+    ax.pie(sizes, labels=labels, 
+                autopct='%1.1f%%', 
+                wedgeprops = { 'linewidth' : 5, 'edgecolor' : 'white'}, 
+                colors = colors, 
+                startangle=90)
+    return fig
+
+
+@cached(ttl=STATIC_TTL)
+def load_history_store():
+    # the memory-mapped store in TS_DASHBOARD_HISTORY, else a year of hourly
+    # readings up to today for the three built-in warehouses;
+    # hourly/daily/monthly rollups are built once here for the range queries
+    path = os.environ.get(HISTORY_ENV)
+    if path:
+        store = HistoryStore.load(path)
+    else:
+        store = synthetic.history_store(list(SITES.values()), HISTORY_HOURS)
+    store.build_rollups()
+    return store
+
+## history range presets: label -> (start, end) for the selected date
+PERIODS = {
+    "日": lambda d: (d, d),
+    "週": lambda d: (d - pd.Timedelta(days=6), d),
+    "月": lambda d: (d.replace(day=1), d.replace(day=1) + pd.offsets.MonthEnd(0)),
+    "年": lambda d: (d - pd.Timedelta(days=364), d),
+}
+
+def history_range(date, period, custom=None):
+    # whole days: start at 00:00 of the first, end just before the day after the last
+    start, end = custom if period == "自訂" else PERIODS[period](pd.Timestamp(date))
+    return pd.Timestamp(start), pd.Timestamp(end) + pd.Timedelta(days=1) - pd.Timedelta(1, "ns")
+
+
+@cached(ttl=STATIC_TTL)
+def get_data_source():
+    return default_data_source()
+
+@cached(ttl=STATIC_TTL)
+def get_metric_feed():
+    source = get_data_source()
+    return MetricFeed(read=lambda site, previous: asyncio.run(source.fetch_realtime(site, previous)))
+
+@cached(ttl=REALTIME_TTL, max_entries=REALTIME_MAX_ENTRIES)
+def load_site_data(site, date):
+    # realtime, storage and inventory are fetched concurrently
+    return load_dashboard_data(get_data_source(), site, date)
+
+@cached(ttl=STATIC_TTL)
+def load_site_lots(site):
+    return load_lots(get_data_source(), site)
+
+@cached(ttl=STATIC_TTL)
+def load_lot_index():
+    # one index over every warehouse, so a material can be found in any of them;
+    # built once from the per-site grids, since lots don't change with the date
+    grids = {site: load_site_lots(site) for site in site_names()}
+    return LotIndex({site: grid for site, grid in grids.items() if grid is not None})
+
+
+# Edit by Tim
+## lot selection and search
+def add_compare_slot(slot_id):
+    # Search button callback: only records the slot; the panel renders in the layout
+    st.session_state["lot_slot"] = slot_id
+    slots = st.session_state.get("compare_slots", [])
+    if slot_id not in slots:
+        st.session_state["compare_slots"] = slots + [slot_id]
+
+def search_lot_detail(lot_grid, row):
+    lot = lot_grid.lot(row)
+    search_lot_str = f"{lot.zone}-{lot.slot}"
+
+    #lot detail
+    st.write("---")
+    st.write(f"##### {search_lot_str} 儲格資訊：")
+    st.write(f"###### 產品編號：{lot.mtrlNum}")
+    st.write(f"###### 目前儲存量：{lot.qty}")
+    st.write(f"###### 剩餘儲存量：{lot.remaining}")
+    st.write(f"###### 入庫時間：{lot.inbound:%Y-%m-%d %H:%M:%S}")
+
+def show_lot_trends(lot_grid, rows, date):
+    # lot detail graph, every selected slot in one Day or Month chart
+    st.write("---")
+    st.write(f"##### {', '.join(lot_grid.slot_ids(rows))} 儲格儲存量變動")
+    ## unlike st.tabs, only the selected chart is built and sent
+    frmt = st.radio("趨勢", ["week", "month"], format_func={"week": "Day", "month": "Month"}.get,
+                    horizontal=True, label_visibility="collapsed", key="lot_trend_frmt")
+    reload_lot_graph(rows, lot_grid, frmt, date)
+
+def reload_lot_graph(rows, lot_grid, frmt, date):
+    # one batched slice of the precomputed day/month rollups for all rows
+    if (frmt == "week"):
+        labels, series = lot_grid.day_series(rows, date)
+    elif (frmt == "month"):
+        labels, series = lot_grid.month_series(rows, date.year)
+    names = lot_grid.slot_ids(rows)
+    option = {
+        "tooltip": {"trigger": "axis"},
+        "legend": {"data": names, "type": "scroll"},
+        "xAxis": {
+            "type": "category",
+            "data": labels,
+        },
+        "yAxis": {"type": "value"},
+        "series": [{"name": name, "data": data, "type": "line"} for name, data in zip(names, series.tolist())],
+    }
+    with span(f"lot_{frmt}_graph", payload=option):
+        st_echarts(
+            options=option, height="400px", key = f"lot_{frmt}_graph"
+        )
+
+
+## each section is a fragment: its own widgets rerun only that section,
+## so e.g. picking a slot doesn't rebuild the history charts
+@fragment("history_section")
+def history_section(site, date):
+    st.write(f"#### :bar_chart:  History Information of {site}")
+    st.write(f"##### {site} 歷史資料")
+    st.write("")
+
+    period = st.radio("區間", list(PERIODS) + ["自訂"], index=2, horizontal=True, key="period")
+    custom = None
+    if period == "自訂":
+        custom = st.date_input("自訂區間", (date - pd.Timedelta(days=30), date))
+        if len(custom) < 2:
+            return
+    start, end = history_range(date, period, custom)
+    title = f"{start:%Y/%m/%d} - {end:%Y/%m/%d}"
+
+    col11, col12 = st.columns(2)
+    history = load_history_store()
+    with span("history_query"):
+        temp_df = history.query(site, "temperature", start, end)
+    chart = get_line_chart(temp_df, "date", "temperature", f"{title} 平均溫度")
+    with span("temperature_chart", payload=chart):
+        col11.altair_chart(chart, use_container_width=True)
+
+    with span("history_query"):
+        humid_df = history.query(site, "humidity", start, end)
+    chart = get_line_chart(humid_df, "date", "humidity", f"{title} 平均濕度")
+    with span("humidity_chart", payload=chart):
+        col12.altair_chart(chart, use_container_width=True)
+
+@fragment("lot_section")
+def lot_section(site, lot_grid, date):
+    option1 = st.selectbox(
+        "",
+        lot_grid.zones,
+        index=0,
+        label_visibility="collapsed",
+        key="lot_zone_select",
+    )
+    option2 = st.selectbox(
+        "",
+        lot_grid.slots,
+        index=0,
+        label_visibility="collapsed",
+        key="lot_slot_select",
+    )
+    slot_id = f"{option1}-{option2}"
+    button_search = st.button('Search', type="primary", on_click=add_compare_slot, args=(slot_id,))
+
+    ## search by slot ID or material number across warehouses
+    query = st.text_input("儲格 / 產品編號查詢", placeholder="A-01 / W2...", key="lot_query")
+    lot_row = None
+    if query:
+        lot_index = load_lot_index()
+        hits = lot_index.search(query)
+        st.dataframe(lot_index.describe(hits), hide_index=True, use_container_width=True)
+        hits = [hit for hit in hits if hit[0] == site]
+        if hits:
+            lot_row = hits[0][1]
+    elif "lot_slot" in st.session_state:
+        lot_row = lot_grid.slot_ids().index(st.session_state["lot_slot"])
+    if lot_row is not None:
+        search_lot_detail(lot_grid, lot_row)
+
+    ## trends of several slots side by side
+    slot_ids = lot_grid.slot_ids()
+    st.session_state["compare_slots"] = [s for s in st.session_state.get("compare_slots", []) if s in slot_ids]
+    compare = st.multiselect("比較儲格", slot_ids, key="compare_slots")
+    if compare:
+        show_lot_trends(lot_grid, [slot_ids.index(s) for s in compare], date)
+
+@fragment("heatmap_section")
+def heatmap_section(site, lot_grid):
+    st.write("---")
+    st.write(f"##### {site} 各儲格目前儲存量")
+
+    ## large grids are tiled server-side; pick a zone to drill down
+    zone = st.selectbox("Zone", ["全部"] + lot_grid.zones, index=0, key="heatmap_zone")
+    matrix = lot_grid.qty_matrix()
+    if zone == "全部":
+        option = heatmap_option(matrix, lot_grid.zones, lot_grid.slots)
+    else:
+        zone_idx = lot_grid.zones.index(zone)
+        option = heatmap_option(matrix[zone_idx:zone_idx + 1], [zone], lot_grid.slots)
+    with span("heatmap", payload=option):
+        st_echarts(option, height="400px")
+
+
+## dashboard strat
+def render(default_site=None):
+    st.set_page_config(layout="wide", page_title="dashboard app")
+    st.markdown(" <style>iframe{ height: 400px !important } ", unsafe_allow_html=True) # Edit by Tim
+    st.title('倉儲 Dashboard')
+
+    ## selet site
+    col001, col002 =  st.columns(2)
+    all_sites = np.array(site_names())
+    col001.write("#### :house: Please select a warehouse")
+    col001.write("##### 請選擇欲查詢倉庫")
+    site = col001.selectbox(" ", all_sites, index = site_index(default_site), key="site")
+    begin_run(site)
+
+    ## selee date
+    col002.write("#### :calendar: Please select a date")
+    col002.write("##### 請選擇欲查詢日期")
+    date = col002.date_input(" ", datetime.now(), key="date")
+
+    st.write("")
+
+    site_data = load_site_data(site, date)
+    lot_grid = load_site_lots(site)
+    if site_data["storage"] is None or site_data["inventory"] is None or lot_grid is None:
+        st.info(f"{site} 沒有 {date} 的資料")
+        st.stop()
+    fake_storage, fake_inventory = site_data["storage"], site_data["inventory"]
+    feed = get_metric_feed()
+    feed.offer(site, site_data["realtime"])
+
+    ## real-time data visulization
+    st.write(f"#### :bar_chart: Real-time Information of {site}")
+    st.write(f"##### {site} 即時資料")
+
+    ### IoT + 庫存KPI, refreshed on its own without rerunning the page
+    metrics_panel(feed, site)
+
+    st.write("")
+
+    ## pie chart
+    col21, col22 = st.columns(2)
+    with col21:
+        option = pie_options("storage", tuple(fake_storage))
+        with span("storage_pie", payload=option):
+            st_echarts(options=option, height="400px", key="storage_pie")
+
+    with col22:
+        option = pie_options("inventory", tuple(fake_inventory))
+        with span("inventory_pie", payload=option):
+            st_echarts(options=option, height="400px", key="inventory_pie")
+
+    st.write("")
+
+    history_section(site, date)
+
+    st.write("")
+
+    st.write(f"#### :bar_chart:  Lot Information of {site}")
+    st.write(f"##### 請選擇欲查詢儲格")
+    col13, col14 = st.columns([1,1])
+
+    with col13:
+        lot_section(site, lot_grid, date)
+
+    with col14:
+        heatmap_section(site, lot_grid)
+
+    end_run()
+
+
+if __name__ == "__main__":
+    render()
@@ -0,0 +1,189 @@
+import abc
+import asyncio
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+
+from instrumentation import span
+from lot_grid import LotGrid
+from lot_movements import MovementLog
+from synthetic import SEED, inventory_split, lot_grid, realtime_reading, rng_for, storage_split
+
+## env var pointing at a local SQLite file to serve data from instead of the fake source
+DB_ENV = "TS_DASHBOARD_DB"
+
+
+class DataSource(abc.ABC):
+    # Warehouse telemetry backend. Every fetch is a coroutine so a page can
+    # issue them all at once with fetch_dashboard_data.
+
+    @abc.abstractmethod
+    async def fetch_realtime(self, site, previous=None):
+        ...
+
+    @abc.abstractmethod
+    async def fetch_storage(self, site, date):
+        ...
+
+    @abc.abstractmethod
+    async def fetch_inventory(self, site, date):
+        ...
+
+    @abc.abstractmethod
+    async def fetch_lots(self, site):
+        ...
+
+
+class SyntheticDataSource(DataSource):
+    # Seeded fake data at any scale: the same (seed, site, date) always
+    # returns the same values; realtime readings walk on a per-site stream.
+
+    def __init__(self, n_zones=5, n_slots=6, seed=SEED):
+        self.n_zones = n_zones
+        self.n_slots = n_slots
+        self.seed = seed
+        self.realtime_rngs = {}
+
+    async def fetch_realtime(self, site, previous=None):
+        rng = self.realtime_rngs.setdefault(site, rng_for("realtime", site, seed=self.seed))
+        return realtime_reading(rng, previous)
+
+    async def fetch_storage(self, site, date):
+        return storage_split(rng_for("storage", site, str(date), seed=self.seed))
+
+    async def fetch_inventory(self, site, date):
+        return inventory_split(rng_for("inventory", site, str(date), seed=self.seed))
+
+    async def fetch_lots(self, site):
+        return lot_grid(rng_for("lots", site, seed=self.seed), self.n_zones, self.n_slots)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS realtime (site TEXT, ts REAL, reading TEXT);
+CREATE TABLE IF NOT EXISTS storage (site TEXT, date TEXT, value TEXT);
+CREATE TABLE IF NOT EXISTS inventory (site TEXT, date TEXT, value TEXT);
+CREATE TABLE IF NOT EXISTS lots (site TEXT, value TEXT);
+CREATE TABLE IF NOT EXISTS movements (site TEXT, unit TEXT, start TEXT, qty BLOB);
+CREATE INDEX IF NOT EXISTS realtime_site ON realtime (site, ts);
+CREATE INDEX IF NOT EXISTS storage_site ON storage (site, date);
+CREATE INDEX IF NOT EXISTS inventory_site ON inventory (site, date);
+CREATE INDEX IF NOT EXISTS lots_site ON lots (site);
+CREATE INDEX IF NOT EXISTS movements_site ON movements (site, unit);
+"""
+
+
+class SQLiteDataSource(DataSource):
+    # Local stand-in backend for tests and offline demos. Values are stored
+    # as JSON, except the lot movement rollups, which are int32 (buckets,
+    # slots) blobs; each query runs on a worker thread with its own connection
+    # so concurrent fetches don't block the event loop or each other.
+
+    def __init__(self, path):
+        self.path = path
+        with sqlite3.connect(path) as conn:
+            conn.executescript(SCHEMA)
+
+    def _query(self, sql, params):
+        with sqlite3.connect(self.path) as conn:
+            row = conn.execute(sql, params).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    async def _fetch(self, sql, *params):
+        return await asyncio.to_thread(self._query, sql, params)
+
+    async def fetch_realtime(self, site, previous=None):
+        return await self._fetch(
+            "SELECT reading FROM realtime WHERE site = ? ORDER BY ts DESC LIMIT 1", site)
+
+    async def _fetch_nearest(self, table, site, date):
+        # snapshot for date, else the latest one before it, else the earliest after it
+        return await self._fetch(
+            f"SELECT value FROM {table} WHERE site = ? "
+            "ORDER BY date > ?, CASE WHEN date <= ? THEN date END DESC, date LIMIT 1",
+            site, str(date), str(date))
+
+    async def fetch_storage(self, site, date):
+        return await self._fetch_nearest("storage", site, date)
+
+    async def fetch_inventory(self, site, date):
+        return await self._fetch_nearest("inventory", site, date)
+
+    def _lots(self, site):
+        with sqlite3.connect(self.path) as conn:
+            row = conn.execute("SELECT value FROM lots WHERE site = ?", (site,)).fetchone()
+            rollups = conn.execute("SELECT unit, start, qty FROM movements WHERE site = ?", (site,)).fetchall()
+        if row is None:
+            return None
+        grid = LotGrid.from_json(json.loads(row[0]))
+        grid.movements = MovementLog.from_rollups(len(grid), {
+            unit: (start, np.frombuffer(qty, dtype=np.int32)) for unit, start, qty in rollups})
+        return grid
+
+    async def fetch_lots(self, site):
+        return await asyncio.to_thread(self._lots, site)
+
+    def write(self, site, date, realtime=None, storage=None, inventory=None, lots=None, ts=None):
+        with sqlite3.connect(self.path) as conn:
+            if realtime is not None:
+                ts = datetime.now().timestamp() if ts is None else ts
+                conn.execute("INSERT INTO realtime VALUES (?, ?, ?)", (site, ts, json.dumps(realtime)))
+            for table, value in (("storage", storage), ("inventory", inventory)):
+                if value is not None:
+                    conn.execute(f"DELETE FROM {table} WHERE site = ? AND date = ?", (site, str(date)))
+                    conn.execute(f"INSERT INTO {table} VALUES (?, ?, ?)", (site, str(date), json.dumps(value)))
+            if lots is not None:
+                conn.execute("DELETE FROM lots WHERE site = ?", (site,))
+                conn.execute("INSERT INTO lots VALUES (?, ?)", (site, json.dumps(lots.to_json())))
+                conn.execute("DELETE FROM movements WHERE site = ?", (site,))
+                for unit in ("D", "M"):
+                    start, array = lots.movements.rollup_array(unit)
+                    if start is not None:
+                        conn.execute("INSERT INTO movements VALUES (?, ?, ?, ?)",
+                                     (site, unit, str(start), array.astype(np.int32).tobytes()))
+
+    @classmethod
+    def from_source(cls, path, source, sites, dates):
+        # snapshot another source into a SQLite file
+        async def fetch_current(site):
+            return await asyncio.gather(source.fetch_realtime(site), source.fetch_lots(site))
+
+        db = cls(path)
+        for site in sites:
+            for date in dates:
+                data = load_dashboard_data(source, site, date)
+                db.write(site, date, storage=data["storage"], inventory=data["inventory"])
+            realtime, lots = asyncio.run(fetch_current(site))
+            db.write(site, None, realtime=realtime, lots=lots)
+        return db
+
+
+def default_data_source():
+    path = os.environ.get(DB_ENV)
+    return SQLiteDataSource(path) if path else SyntheticDataSource()
+
+
+async def timed_fetch(name, fetch):
+    with span(name):
+        return await fetch
+
+
+async def fetch_dashboard_data(source, site, date):
+    # all per-date page fetches run concurrently, so latency is the slowest one
+    realtime, storage, inventory = await asyncio.gather(
+        timed_fetch("fetch_realtime", source.fetch_realtime(site)),
+        timed_fetch("fetch_storage", source.fetch_storage(site, date)),
+        timed_fetch("fetch_inventory", source.fetch_inventory(site, date)),
+    )
+    return {"realtime": realtime, "storage": storage, "inventory": inventory}
+
+
+def load_dashboard_data(source, site, date):
+    return asyncio.run(fetch_dashboard_data(source, site, date))
+
+
+def load_lots(source, site):
+    # the lot grid doesn't depend on the date, so pages cache it per site on its own
+    return asyncio.run(timed_fetch("fetch_lots", source.fetch_lots(site)))
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return values.astype(float)
+
+
+def lttb(x, y, n_out):
+    # Largest-Triangle-Three-Buckets: returns the indices of the kept points.
+    # The bucket loop is bounded by n_out (the chart's pixel width), the work
+    # inside each bucket is vectorized.
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = _as_float(x)
+    y = _as_float(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    starts, ends = edges[:-1], edges[1:]
+
+    # the third triangle vertex is the mean of the next bucket
+    csum_x = np.concatenate([[0.0], np.cumsum(x)])
+    csum_y = np.concatenate([[0.0], np.cumsum(y)])
+    next_starts = np.append(ends[:-1], n - 1)
+    next_ends = np.append(ends[1:], n)
+    avg_x = (csum_x[next_ends] - csum_x[next_starts]) / (next_ends - next_starts)
+    avg_y = (csum_y[next_ends] - csum_y[next_starts]) / (next_ends - next_starts)
+
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for b, (lo, hi) in enumerate(zip(starts, ends)):
+        area = np.abs(
+            (x[a] - avg_x[b]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (avg_y[b] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        keep[b + 1] = a
+    return keep
+
+
+def min_max(x, y, n_out):
+    # keeps the min and max of each of n_out // 2 equal-width buckets
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+
+    y = _as_float(y)
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(n_buckets, size)
+    valid = ~np.all(np.isnan(padded), axis=1)
+    base = np.arange(n_buckets)[valid] * size
+    lows = base + np.nanargmin(padded[valid], axis=1)
+    highs = base + np.nanargmax(padded[valid], axis=1)
+    return np.unique(np.concatenate([lows, highs]))
+
+
+DOWNSAMPLERS = {"lttb": lttb, "minmax": min_max}
+
+
+def downsample(data, x_axis, y_axis, n_out, method="lttb", by="site"):
+    # downsample each series (one per `by` value) to at most n_out points
+    pick = DOWNSAMPLERS[method]
+    if by not in data.columns:
+        return data.iloc[pick(data[x_axis].to_numpy(), data[y_axis].to_numpy(), n_out)]
+
+    parts = []
+    for _, group in data.groupby(by, sort=False):
+        idx = pick(group[x_axis].to_numpy(), group[y_axis].to_numpy(), n_out)
+        parts.append(group.iloc[idx])
+    return pd.concat(parts) if parts else data
@@ -0,0 +1,50 @@
+from functools import lru_cache
+
+EMPHASIS = {
+    "itemStyle": {
+        "shadowBlur": 10,
+        "shadowOffsetX": 0,
+        "shadowColor": "rgba(0, 0, 0, 0.5)"}
+}
+
+## pie templates are built once; only the numeric data is patched in per (site, date)
+PIE_TEMPLATES = {
+    "storage": {
+        "title": {"text": "倉庫使用率", "subtext":"Storage Utilization", "left": "center"},
+        "tooltip": {"trigger": "item"},
+        "series": [
+            {
+                "name": "Storage Utilization",
+                "type": "pie",
+                "radius": "50%",
+                "emphasis": EMPHASIS,
+            }
+        ],
+    },
+    "inventory": {
+        "title": {"text": "庫存類型佔比", "subtext": "Inventory Type","left": "center"},
+        "tooltip": {"trigger": "item"},
+        "series": [
+            {
+                "name": "Storage Utilization",
+                "type": "pie",
+                "radius": "50%",
+                "emphasis": EMPHASIS,
+            }
+        ],
+    },
+}
+
+PIE_LABELS = {
+    "storage": ["Empty", "Reserved", "Occupied"],
+    "inventory": ["Finished\nProducts", "Semi-Finished\nProducts", "Defective\nProducts", "Raw\nMaterial"],
+}
+
+
+@lru_cache(maxsize=512)
+def pie_options(kind, values):
+    # values must be a tuple of numbers; the same values return the same
+    # dict, so unchanged pies are never rebuilt. Treat the result as read-only.
+    template = PIE_TEMPLATES[kind]
+    data = [{"value": value, "name": name} for value, name in zip(values, PIE_LABELS[kind])]
+    return {**template, "series": [{**template["series"][0], "data": data}]}
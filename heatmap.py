@@ -0,0 +1,74 @@
+import numpy as np
+
+from lot_grid import CAPACITY
+
+HEATMAP_MAX_CELLS = 600      # above this the grid is aggregated into tiles
+LABEL_MAX_CELLS = 60         # per-cell value labels only on small grids
+
+
+def tile_factors(n_rows, n_cols, max_cells=HEATMAP_MAX_CELLS):
+    # smallest square-ish (rows, cols) tile so that the tiled grid fits max_cells
+    fy = fx = 1
+    while -(-n_rows // fy) * -(-n_cols // fx) > max_cells:
+        if -(-n_rows // fy) >= -(-n_cols // fx):
+            fy += 1
+        else:
+            fx += 1
+    return fy, fx
+
+
+def aggregate(matrix, fy, fx):
+    # mean of each fy x fx tile, ignoring the padding of partial edge tiles
+    n_rows, n_cols = matrix.shape
+    rows, cols = -(-n_rows // fy), -(-n_cols // fx)
+    padded = np.full((rows * fy, cols * fx), np.nan)
+    padded[:n_rows, :n_cols] = matrix
+    tiles = padded.reshape(rows, fy, cols, fx)
+    counts = (~np.isnan(tiles)).sum(axis=(1, 3))
+    return np.nansum(tiles, axis=(1, 3)) / np.maximum(counts, 1)
+
+
+def tile_labels(labels, f):
+    if f == 1:
+        return list(labels)
+    return [f"{labels[i]}-{labels[min(i + f, len(labels)) - 1]}" for i in range(0, len(labels), f)]
+
+
+def heatmap_cells(matrix):
+    # [[x, y, value], ...] with integer values; empty slots are left out
+    # instead of being sent as "-" strings
+    y, x = np.nonzero(matrix > 0)
+    return np.column_stack([x, y, np.rint(matrix[y, x])]).astype(int).tolist()
+
+
+def heatmap_option(matrix, row_labels, col_labels, max_cells=HEATMAP_MAX_CELLS):
+    fy, fx = tile_factors(*matrix.shape, max_cells)
+    if fy > 1 or fx > 1:
+        matrix = aggregate(matrix, fy, fx)
+    n_cells = matrix.size
+
+    return {
+        "tooltip": {"position": "top"},
+        "grid": {"height": "50%", "top": "10%"},
+        "xAxis": {"type": "category", "data": tile_labels(col_labels, fx), "splitArea": {"show": True}},
+        "yAxis": {"type": "category", "data": tile_labels(row_labels, fy), "splitArea": {"show": True}},
+        "visualMap": {
+            "min": 0,
+            "max": CAPACITY,
+            "calculable": True,
+            "orient": "horizontal",
+            "left": "center",
+            "bottom": "15%",
+        },
+        "series": [
+            {
+                "name": "Punch Card",
+                "type": "heatmap",
+                "data": heatmap_cells(matrix),
+                "label": {"show": n_cells <= LABEL_MAX_CELLS},
+                "emphasis": {
+                    "itemStyle": {"shadowBlur": 10, "shadowColor": "rgba(0, 0, 0, 0.5)"}
+                },
+            }
+        ],
+    }
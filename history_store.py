@@ -0,0 +1,182 @@
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+## rollup name -> datetime64 unit of its buckets, finest first
+ROLLUPS = {"hour": "h", "day": "D", "month": "M"}
+MAX_POINTS = 800         # a range query returns at most about this many rows
+
+
+class HistoryStore:
+    # site-partitioned columnar store: each site keeps its own sorted
+    # datetime64 array plus one NumPy array per measurement field, so a
+    # query only touches the rows of the selected site and date window.
+
+    def __init__(self):
+        self.partitions = {}
+        self.rollups = {}
+
+    def sites(self):
+        return list(self.partitions)
+
+    def append(self, site, dates, **fields):
+        dates = np.asarray(dates, dtype="datetime64[ns]")
+        part = self.partitions.get(site)
+        if part is None:
+            part = {"date": dates[:0]}
+            self.partitions[site] = part
+
+        merged = {"date": np.concatenate([part["date"], dates])}
+        for name in set(part) - {"date"} | set(fields):
+            old = part.get(name, np.full(len(part["date"]), np.nan))
+            new = np.asarray(fields.get(name, np.full(len(dates), np.nan)), dtype=float)
+            merged[name] = np.concatenate([old, new])
+
+        order = np.argsort(merged["date"], kind="stable")
+        self.partitions[site] = {name: col[order] for name, col in merged.items()}
+        for key in [key for key in self.rollups if key[0] == site]:
+            del self.rollups[key]
+
+    def window(self, site, start=None, end=None):
+        # [lo, hi) row bounds of the partition for start <= date <= end
+        dates = self.partitions[site]["date"]
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), "left")
+        hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), "right")
+        return lo, hi
+
+    def slice(self, site, fields, start=None, end=None):
+        if isinstance(fields, str):
+            fields = [fields]
+        part = self.partitions[site]
+        lo, hi = self.window(site, start, end)
+        data = {"site": np.full(hi - lo, site, dtype=object), "date": part["date"][lo:hi]}
+        for name in fields:
+            data[name] = part[name][lo:hi]
+        return pd.DataFrame(data)
+
+    def save(self, root):
+        # replaces whatever store was saved under root, so dropped sites don't load again
+        if os.path.isdir(root):
+            for entry in os.listdir(root):
+                path = os.path.join(root, entry)
+                if os.path.isfile(os.path.join(path, "site.txt")):
+                    shutil.rmtree(path)
+        for n, (site, part) in enumerate(self.partitions.items()):
+            path = os.path.join(root, f"site_{n:03d}")
+            os.makedirs(path, exist_ok=True)
+            with open(os.path.join(path, "site.txt"), "w", encoding="utf-8") as f:
+                f.write(site)
+            for name, col in part.items():
+                np.save(os.path.join(path, f"{name}.npy"), col)
+
+    @classmethod
+    def load(cls, root, mmap=True):
+        store = cls()
+        for entry in sorted(os.listdir(root)):
+            path = os.path.join(root, entry)
+            if not os.path.isfile(os.path.join(path, "site.txt")):
+                continue
+            with open(os.path.join(path, "site.txt"), encoding="utf-8") as f:
+                site = f.read()
+            store.partitions[site] = {
+                name[:-4]: np.load(os.path.join(path, name), mmap_mode="r" if mmap else None)
+                for name in os.listdir(path) if name.endswith(".npy")
+            }
+        return store
+
+    def rollup(self, site, field, name):
+        # count/sum/min/max per hour, day or month bucket, built once per
+        # (site, field) and dropped when the site gets new readings
+        key = (site, field, name)
+        if key not in self.rollups:
+            part = self.partitions[site]
+            buckets = part["date"].astype(f"datetime64[{ROLLUPS[name]}]")
+            keys, starts = np.unique(buckets, return_index=True)
+            values = np.asarray(part[field])
+            valid = ~np.isnan(values)
+            if len(keys):
+                self.rollups[key] = {
+                    "date": keys.astype("datetime64[ns]"),
+                    "count": np.add.reduceat(valid, starts),
+                    "sum": np.add.reduceat(np.where(valid, values, 0.0), starts),
+                    "min": np.fmin.reduceat(values, starts),
+                    "max": np.fmax.reduceat(values, starts),
+                }
+            else:
+                empty = np.empty(0)
+                self.rollups[key] = {"date": keys.astype("datetime64[ns]"), "count": empty,
+                                     "sum": empty, "min": empty, "max": empty}
+        return self.rollups[key]
+
+    def build_rollups(self):
+        for site, part in self.partitions.items():
+            for field in set(part) - {"date"}:
+                for name in ROLLUPS:
+                    self.rollup(site, field, name)
+
+    def resolution(self, site, start=None, end=None, max_points=MAX_POINTS):
+        # finest of raw/hour/day/month that keeps the window within max_points
+        lo, hi = self.window(site, start, end)
+        if hi - lo <= max_points:
+            return "raw"
+        dates = self.partitions[site]["date"]
+        first = dates[lo] if start is None else np.datetime64(pd.Timestamp(start))
+        last = dates[hi - 1] if end is None else np.datetime64(pd.Timestamp(end))
+        for name, unit in ROLLUPS.items():
+            if (last.astype(f"datetime64[{unit}]") - first.astype(f"datetime64[{unit}]")).astype(int) + 1 <= max_points:
+                return name
+        return list(ROLLUPS)[-1]
+
+    def query(self, site, field, start=None, end=None, resolution=None):
+        # readings of one field in [start, end], served from the coarsest-needed
+        # rollup so a long range reads a few hundred rows instead of every reading
+        resolution = resolution or self.resolution(site, start, end)
+        if resolution == "raw":
+            data = self.slice(site, field, start, end)
+            data["min"] = data["max"] = data[field]
+            return data
+
+        rollup = self.rollup(site, field, resolution)
+        unit = ROLLUPS[resolution]
+        lo = 0 if start is None else np.searchsorted(
+            rollup["date"], np.datetime64(pd.Timestamp(start)).astype(f"datetime64[{unit}]"), "left")
+        hi = len(rollup["date"]) if end is None else np.searchsorted(
+            rollup["date"], np.datetime64(pd.Timestamp(end)), "right")
+        count = rollup["count"][lo:hi]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = rollup["sum"][lo:hi] / count
+        return pd.DataFrame({
+            "site": np.full(hi - lo, site, dtype=object),
+            "date": rollup["date"][lo:hi],
+            field: np.round(mean, 1),
+            "min": rollup["min"][lo:hi],
+            "max": rollup["max"][lo:hi],
+        })
+
+    def daily_stats(self, field, start=None, end=None, sites=None):
+        # per-site daily mean/min/max/p95 for many sites in one groupby
+        if sites is None:
+            sites = self.sites()
+        if not sites:
+            return pd.DataFrame(columns=["site", "date", "mean", "min", "max", "p95"])
+        frames = [self.slice(site, field, start, end) for site in sites]
+        data = pd.concat(frames, ignore_index=True)
+        grouped = data.groupby(["site", data["date"].dt.floor("D")], sort=False)[field]
+        stats = grouped.agg(["mean", "min", "max"])
+        stats["p95"] = grouped.quantile(0.95)
+        return stats.reset_index()
+
+    def window_stats(self, field, start=None, end=None, sites=None):
+        # per-site mean/min/max/p95 over every reading in [start, end]; the
+        # p95 of the whole window, not a summary of the daily p95s
+        if sites is None:
+            sites = self.sites()
+        rows = {}
+        for site in sites:
+            lo, hi = self.window(site, start, end)
+            values = np.asarray(self.partitions[site][field][lo:hi])
+            values = values[~np.isnan(values)]
+            if len(values):
+                rows[site] = [values.mean(), values.min(), values.max(), np.percentile(values, 95)]
+        return pd.DataFrame.from_dict(rows, orient="index", columns=["mean", "min", "max", "p95"])
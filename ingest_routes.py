@@ -0,0 +1,21 @@
+import argparse
+
+from routes import RouteStore
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert route JSON into the columnar .npy format, with per-zoom simplified copies, "
+                    "that the logistics page memory-maps.")
+    parser.add_argument("source", help="route JSON, e.g. route3.json")
+    parser.add_argument("target", help="output directory, e.g. route3.routes")
+    args = parser.parse_args(argv)
+
+    store = RouteStore.from_json(args.source)
+    store.save(args.target)
+    store.save_lods(args.target)
+    print(f"{len(store)} routes, {len(store.coords)} points -> {args.target}")
+
+
+if __name__ == "__main__":
+    main()
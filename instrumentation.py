@@ -0,0 +1,263 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import altair as alt
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+## opt-in: set either env var, or open a page with ?debug=1 for the panel
+METRICS_ENV = "TS_DASHBOARD_METRICS"            # Prometheus text file rewritten after every rerun
+METRICS_PORT_ENV = "TS_DASHBOARD_METRICS_PORT"  # serve the same text at http://host:port/metrics
+DEBUG_PARAM = "debug"
+
+## (section, site, action) -> count / seconds / max_seconds / payload_bytes, process-wide
+SECTION_STATS = {}
+_lock = threading.Lock()
+_server = None
+
+## each session's script runs in its own thread, so the current site, user
+## action and this rerun's spans are thread-local
+_context = threading.local()
+_logger = logging.getLogger(__name__)
+
+
+def enabled():
+    return getattr(_context, "enabled", False)
+
+
+def _arrow_dataset(data):
+    # Altair data transformer that sizes each dataset the way st.altair_chart
+    # ships it, as Arrow, and leaves only its name in the spec; unlike the
+    # default transformer it has no row cap
+    table = pa.Table.from_pandas(data)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    raw = sink.getvalue()
+    name = hashlib.md5(raw).hexdigest()
+    _context.datasets[name] = raw.size
+    return {"name": name}
+
+alt.data_transformers.register("ts_dashboard_payload", _arrow_dataset)
+
+
+def payload_size(payload):
+    # bytes a render call ships; only computed while instrumentation is on
+    if payload is None:
+        return 0
+    if isinstance(payload, alt.TopLevelMixin):
+        _context.datasets = {}
+        with alt.data_transformers.enable("ts_dashboard_payload"):
+            spec = payload.to_dict(validate=False)
+        return len(json.dumps(spec).encode("utf-8")) + sum(_context.datasets.values())
+    if isinstance(payload, (dict, list)):
+        text = json.dumps(payload, default=str)
+    else:
+        text = payload.to_json()                  # pydeck
+    return len(text.encode("utf-8"))
+
+
+def record(section, seconds, nbytes=0):
+    site, action = getattr(_context, "site", ""), getattr(_context, "action", "")
+    with _lock:
+        stats = SECTION_STATS.setdefault((section, site, action),
+                                         {"count": 0, "seconds": 0.0, "max_seconds": 0.0, "payload_bytes": 0})
+        stats["count"] += 1
+        stats["seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+        stats["payload_bytes"] += nbytes
+    _context.spans.append((section, seconds, nbytes))
+
+
+@contextmanager
+def span(section, payload=None):
+    # times the block; payload is the object the block sends to the browser
+    if not enabled():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        try:
+            nbytes = payload_size(payload)
+        except Exception:
+            # measuring must never break the page
+            _logger.warning("could not measure the payload of %s", section, exc_info=True)
+            nbytes = 0
+        record(section, seconds, nbytes)
+
+
+def timed(section):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(section):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _widget_state():
+    return {key: repr(value) for key, value in st.session_state.items() if not key.startswith("_")}
+
+
+def _changed_widget():
+    # the one keyed widget (or callback-set state) that triggered this rerun, so
+    # the action label stays within the page's fixed set of keys; a pressed
+    # button or form submit wins over the values it submitted
+    previous = st.session_state.get("_instrumentation_state")
+    if previous is None:
+        return "load"
+    state = _widget_state()
+    changed = sorted(key for key in state if previous.get(key) != state[key])
+    triggers = [key for key in changed if state[key] == "True"]
+    return (triggers or changed or ["rerun"])[0]
+
+
+def begin_run(site=""):
+    # call once near the top of a page; attributes the rerun's spans to site and the triggering widget
+    _context.enabled = bool(os.environ.get(METRICS_ENV) or os.environ.get(METRICS_PORT_ENV)
+                            or st.query_params.get(DEBUG_PARAM))
+    _context.spans = []
+    _context.start = time.perf_counter()
+    _context.site = site
+    _context.action = _changed_widget() if _context.enabled else ""
+    st.session_state["_instrumentation_site"] = site
+    if os.environ.get(METRICS_PORT_ENV):
+        serve(int(os.environ[METRICS_PORT_ENV]))
+
+
+def _fragment_rerun():
+    # true when Streamlit reruns only fragments, so the page's begin_run/end_run are skipped;
+    # newer releases set fragment_ids_this_run, 1.37 only queues the ids on the script requests
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return False
+    if ctx.fragment_ids_this_run:
+        return True
+    return bool(ctx.script_requests and ctx.script_requests.fragment_id_queue)
+
+
+def fragment(section, run_every=None):
+    # st.fragment timed as one span; when it reruns on its own the page's
+    # site is restored and the metrics are exported once it finishes
+    def decorator(func):
+        @st.fragment(run_every=run_every)
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            alone = _fragment_rerun()
+            if alone:
+                begin_run(st.session_state.get("_instrumentation_site", ""))
+            try:
+                with span(section):
+                    return func(*args, **kwargs)
+            finally:
+                if alone and enabled():
+                    st.session_state["_instrumentation_state"] = _widget_state()
+                    if os.environ.get(METRICS_ENV):
+                        export(os.environ[METRICS_ENV])
+        return wrapper
+    return decorator
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text():
+    with _lock:
+        items = sorted(SECTION_STATS.items())
+    metrics = [
+        ("ts_dashboard_section_seconds", "summary", "Wall time spent in a dashboard section.",
+         [("_sum", "seconds"), ("_count", "count")]),
+        ("ts_dashboard_section_max_seconds", "gauge", "Slowest single run of a dashboard section.",
+         [("", "max_seconds")]),
+        ("ts_dashboard_payload_bytes_total", "counter", "JSON bytes a section sent to the browser.",
+         [("", "payload_bytes")]),
+    ]
+    lines = []
+    for name, kind, help_text, samples in metrics:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for (section, site, action), stats in items:
+            labels = f'section="{_label(section)}",site="{_label(site)}",action="{_label(action)}"'
+            lines += [f"{name}{suffix}{{{labels}}} {stats[key]}" for suffix, key in samples]
+
+    caches = sorted(_cache_stats().items())
+    for key, help_text in (("hits", "Cached loader calls served from the cache."),
+                           ("misses", "Cached loader calls that recomputed the value.")):
+        name = f"ts_dashboard_cache_{key}_total"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        lines += [f'{name}{{cache="{_label(cache)}"}} {stats[key]}' for cache, stats in caches]
+    return "\n".join(lines) + "\n"
+
+
+def _cache_stats():
+    # imported here: caching wraps every loader in a span, so it imports this module
+    from caching import cache_stats
+    return cache_stats()
+
+
+def export(path):
+    # written to a temp file first so a scraper never reads half a file
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200 if self.path == "/metrics" else 404)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.end_headers()
+        if self.path == "/metrics":
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port):
+    # one scrape endpoint per process, started by the first rerun
+    global _server
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer(("", port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+
+
+def end_run():
+    # call once at the end of a page: exports metrics and draws the debug panel
+    if not enabled():
+        return
+    st.session_state["_instrumentation_state"] = _widget_state()
+    if os.environ.get(METRICS_ENV):
+        export(os.environ[METRICS_ENV])
+    if not st.query_params.get(DEBUG_PARAM):
+        return
+    # spans nest (a cached loader wraps its fetchers), so the header shows wall time instead of their sum
+    spans = pd.DataFrame(_context.spans, columns=["section", "seconds", "payload_bytes"])
+    elapsed = (time.perf_counter() - _context.start) * 1000
+    with st.expander(f"⏱ 本次執行 {elapsed:.0f} ms（{_context.action}）"):
+        st.dataframe(
+            spans.groupby("section", sort=False).agg(calls=("seconds", "size"), ms=("seconds", "sum"),
+                                                     payload_kb=("payload_bytes", "sum"))
+            .assign(ms=lambda df: (df.ms * 1000).round(1), payload_kb=lambda df: (df.payload_kb / 1024).round(1))
+            .sort_values("ms", ascending=False),
+            use_container_width=True,
+        )
+        st.dataframe(pd.DataFrame.from_dict(_cache_stats(), orient="index", columns=["hits", "misses"]),
+                     use_container_width=True)
+        st.download_button("Prometheus metrics", prometheus_text(), file_name="ts_dashboard.prom")
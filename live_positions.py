@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+## one JSON object per line: {"貨物編號": ..., "lon": ..., "lat": ..., "ts": ...}
+FEED_PATH = 'positions.jsonl'
+REFRESH_SECONDS = 5
+TRAIL_SIZE = 32          # positions kept per shipment
+
+
+class PositionBuffer:
+    # fixed-size ring buffer of (lon, lat, ts) per shipment
+
+    def __init__(self, capacity=TRAIL_SIZE):
+        self.capacity = capacity
+        self.index = {}
+        self.points = np.full((0, capacity, 3), np.nan)
+        self.count = np.zeros(0, dtype=np.int64)
+
+    def _slot(self, shipment):
+        slot = self.index.get(shipment)
+        if slot is None:
+            slot = self.index[shipment] = len(self.index)
+            if slot == len(self.points):
+                grow = max(16, len(self.points))
+                self.points = np.concatenate([self.points, np.full((grow, self.capacity, 3), np.nan)])
+                self.count = np.concatenate([self.count, np.zeros(grow, dtype=np.int64)])
+        return slot
+
+    def push(self, shipment, lon, lat, ts):
+        slot = self._slot(shipment)
+        self.points[slot, self.count[slot] % self.capacity] = (lon, lat, ts)
+        self.count[slot] += 1
+
+    def latest(self):
+        # one row per shipment with its most recent position
+        n = len(self.index)
+        if n == 0:
+            return pd.DataFrame(columns=["貨物編號", "lon", "lat", "ts"])
+        slots = np.arange(n)
+        last = self.points[slots, (self.count[:n] - 1) % self.capacity]
+        return pd.DataFrame({
+            "貨物編號": list(self.index),
+            "lon": last[:, 0],
+            "lat": last[:, 1],
+            "ts": last[:, 2],
+        })
+
+    def trail(self, shipment):
+        # positions of one shipment, oldest first
+        slot = self.index[shipment]
+        n = min(self.count[slot], self.capacity)
+        order = (self.count[slot] - n + np.arange(n)) % self.capacity
+        return self.points[slot, order]
+
+
+class FeedTail:
+    # follows an append-only JSONL file, returning only lines added since the last read
+
+    def __init__(self, path=FEED_PATH):
+        self.path = path
+        self.offset = 0
+
+    def read(self):
+        if not os.path.isfile(self.path):
+            return []
+        if os.path.getsize(self.path) < self.offset:
+            self.offset = 0     # truncated or rotated
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        # a partially written last line is left for the next read
+        complete = data[:data.rfind(b"\n") + 1]
+        self.offset += len(complete)
+        return [json.loads(line) for line in complete.decode("utf-8").splitlines() if line.strip()]
+
+
+class LivePositions:
+    # process-wide live state: one tail of the feed shared by every session
+
+    def __init__(self, path=FEED_PATH, capacity=TRAIL_SIZE):
+        self.tail = FeedTail(path)
+        self.buffer = PositionBuffer(capacity)
+        self.lock = threading.Lock()
+
+    def poll(self):
+        with self.lock:
+            for update in self.tail.read():
+                self.buffer.push(update["貨物編號"], update["lon"], update["lat"], update.get("ts", time.time()))
+            return self.buffer.latest()
+
+
+def write_demo_feed(routes, path=FEED_PATH, steps=20, interval=1.0):
+    # local stand-in for a GPS gateway: moves every shipment along its route
+    for step in range(steps):
+        with open(path, "a", encoding="utf-8") as f:
+            for row, shipment in enumerate(routes.ids):
+                coords = routes.path(row)
+                lon, lat = coords[min(step, len(coords) - 1)]
+                f.write(json.dumps({"貨物編號": shipment, "lon": float(lon), "lat": float(lat),
+                                    "ts": time.time()}, ensure_ascii=False) + "\n")
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    from routes import RouteStore
+    write_demo_feed(RouteStore.from_json('route3.json'), steps=1000)
@@ -0,0 +1,179 @@
+import json
+import numpy as np
+import pandas as pd
+
+from lot_movements import MovementLog
+
+CAPACITY = 10000         # units per slot
+
+
+def zone_names(n):
+    # A..Z, then AA, AB, ...
+    names = []
+    for i in range(n):
+        name = ""
+        i += 1
+        while i:
+            i, r = divmod(i - 1, 26)
+            name = chr(65 + r) + name
+        names.append(name)
+    return names
+
+
+def slot_names(n):
+    width = max(2, len(str(n)))
+    return [str(j + 1).zfill(width) for j in range(n)]
+
+
+class LotGrid:
+    # Typed, column-oriented lot table: one row per slot in zone-major order,
+    # plus the per-slot movement log whose day/month rollups feed the trends.
+
+    def __init__(self, zones, slots, lots, movements):
+        self.zones = list(zones)
+        self.slots = list(slots)
+        self.lots = lots
+        self.movements = movements
+
+    @property
+    def shape(self):
+        return len(self.zones), len(self.slots)
+
+    def __len__(self):
+        return len(self.lots)
+
+    @classmethod
+    def from_columns(cls, n_zones, n_slots, mtrlNum, qty, inbound, movements):
+        zones, slots = zone_names(n_zones), slot_names(n_slots)
+        zone_idx, slot_idx = np.divmod(np.arange(n_zones * n_slots), n_slots)
+        qty = np.asarray(qty, dtype=np.int32)
+        lots = pd.DataFrame({
+            "zone": pd.Categorical.from_codes(zone_idx, zones),
+            "slot": pd.Categorical.from_codes(slot_idx, slots),
+            "zone_idx": zone_idx.astype(np.int32),
+            "slot_idx": slot_idx.astype(np.int32),
+            "mtrlNum": np.asarray(mtrlNum, dtype=object),
+            "qty": qty,
+            "remaining": (CAPACITY - qty).astype(np.int32),
+            "inbound": pd.to_datetime(np.asarray(inbound)).astype("datetime64[ns]"),
+        })
+        return cls(zones, slots, lots, movements)
+
+    @classmethod
+    def random(cls, n_zones=5, n_slots=6, rng=None, today=None):
+        rng = np.random.default_rng() if rng is None else rng
+        n = n_zones * n_slots
+        start = np.datetime64("2023-01-02T00:00:00")
+        span = int((np.datetime64("2023-01-10T23:59:59") - start) / np.timedelta64(1, "s"))
+        return cls.from_columns(
+            n_zones, n_slots,
+            mtrlNum=np.char.add("W", rng.integers(2000000, 3000000, n).astype(str)).astype(object),
+            qty=rng.integers(0, CAPACITY, n),
+            inbound=start + rng.integers(0, span, n).astype("timedelta64[s]"),
+            movements=MovementLog.random(n, np.datetime64("today") if today is None else today, rng=rng),
+        )
+
+    def to_json(self):
+        return json.dumps({
+            "shape": self.shape,
+            "mtrlNum": self.lots["mtrlNum"].tolist(),
+            "qty": self.lots["qty"].tolist(),
+            "inbound": self.lots["inbound"].dt.strftime("%Y-%m-%d %H:%M:%S").tolist(),
+        })
+
+    @classmethod
+    def from_json(cls, text, movements=None):
+        # the lot columns only; the movement log is stored apart as rollup arrays
+        data = json.loads(text)
+        n_zones, n_slots = data["shape"]
+        return cls.from_columns(n_zones, n_slots, data["mtrlNum"], data["qty"], data["inbound"],
+                                MovementLog(n_zones * n_slots) if movements is None else movements)
+
+    def row(self, zone_idx, slot_idx):
+        return zone_idx * len(self.slots) + slot_idx
+
+    def slot_ids(self, rows=None):
+        ids = self.lots["zone"].astype(str) + "-" + self.lots["slot"].astype(str)
+        return ids.tolist() if rows is None else ids.iloc[rows].tolist()
+
+    def lot(self, row):
+        return self.lots.iloc[row]
+
+    def record_movement(self, rows, times, qty):
+        # an inventory event: adjust stock and the touched day/month buckets only
+        rows = np.atleast_1d(rows)
+        delta = np.zeros(len(self), dtype=np.int64)
+        np.add.at(delta, rows, np.atleast_1d(qty))
+        stock = np.clip(self.lots["qty"].to_numpy() + delta, 0, CAPACITY).astype(np.int32)
+        self.lots["qty"] = stock
+        self.lots["remaining"] = CAPACITY - stock
+        self.movements.record(rows, times, qty)
+
+    def day_series(self, rows, end, n=7):
+        labels, series = self.movements.days(end, n)
+        return labels, series[rows]
+
+    def month_series(self, rows, year):
+        labels, series = self.movements.months(year)
+        return labels, series[rows]
+
+    def qty_matrix(self):
+        # (zones, slots) matrix of current quantities
+        return self.lots["qty"].to_numpy().reshape(self.shape)
+
+    def zone_totals(self):
+        return self.qty_matrix().sum(axis=1)
+
+    def utilization(self):
+        return self.lots["qty"].sum() / (len(self) * CAPACITY)
+
+
+class LotIndex:
+    # Lookup index over one or more warehouses' lot grids: hash maps from
+    # slot ID ("A-01") and mtrlNum to (site, row), plus a sorted mtrlNum
+    # array for prefix search with binary search.
+
+    def __init__(self, grids):
+        self.grids = grids
+        self.by_slot = {}
+        self.by_mtrl = {}
+        sites, rows, mtrls = [], [], []
+        for site, grid in grids.items():
+            for row, (slot_id, mtrl) in enumerate(zip(grid.slot_ids(), grid.lots["mtrlNum"].tolist())):
+                self.by_slot.setdefault(slot_id, []).append((site, row))
+                self.by_mtrl.setdefault(mtrl, []).append((site, row))
+            sites.extend([site] * len(grid))
+            rows.append(np.arange(len(grid)))
+            mtrls.extend(grid.lots["mtrlNum"].tolist())
+
+        order = np.argsort(mtrls, kind="stable")
+        self.mtrls = np.asarray(mtrls, dtype=str)[order]
+        self.sites = np.asarray(sites, dtype=object)[order]
+        self.rows = np.concatenate(rows)[order] if rows else np.empty(0, dtype=int)
+
+    def slot(self, slot_id, site=None):
+        hits = self.by_slot.get(slot_id.strip().upper(), [])
+        return [hit for hit in hits if site is None or hit[0] == site]
+
+    def material(self, mtrlNum, site=None):
+        hits = self.by_mtrl.get(mtrlNum.strip().upper(), [])
+        return [hit for hit in hits if site is None or hit[0] == site]
+
+    def prefix(self, prefix, site=None, limit=50):
+        prefix = prefix.strip().upper()
+        lo = np.searchsorted(self.mtrls, prefix, "left")
+        hi = np.searchsorted(self.mtrls, prefix + "\uffff", "right")
+        hits = [(s, int(r)) for s, r in zip(self.sites[lo:hi], self.rows[lo:hi])
+                if site is None or s == site]
+        return hits[:limit]
+
+    def search(self, query, site=None, limit=50):
+        # exact slot ID, then exact mtrlNum, then mtrlNum prefix
+        return (self.slot(query, site) or self.material(query, site)
+                or self.prefix(query, site, limit))
+
+    def describe(self, hits):
+        frames = [self.grids[site].lots.iloc[[row]].assign(site=site) for site, row in hits]
+        if not frames:
+            return pd.DataFrame(columns=["site", "zone", "slot", "mtrlNum", "qty", "remaining"])
+        return pd.concat(frames)[["site", "zone", "slot", "mtrlNum", "qty", "remaining"]]
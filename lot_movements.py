@@ -0,0 +1,94 @@
+import numpy as np
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "June", "July", "Aug", "Sept", "Oct", "Nov", "Dec"]
+
+
+class MovementLog:
+    # Append-only per-slot inventory movements (slot, time, +/- qty) with
+    # day and month rollups kept up to date on every insert: recording an
+    # event only adds into the buckets it falls in, so the Day/Month charts
+    # read precomputed arrays instead of re-aggregating raw movements.
+
+    def __init__(self, n_slots):
+        self.n_slots = n_slots
+        self.chunks = []
+        self.daily = {}      # datetime64[D] -> (n_slots,) net qty
+        self.monthly = {}    # datetime64[M] -> (n_slots,) net qty
+
+    def __len__(self):
+        return sum(len(chunk[0]) for chunk in self.chunks)
+
+    def record(self, slots, times, qty):
+        slots = np.atleast_1d(np.asarray(slots, dtype=np.int64))
+        times = np.atleast_1d(np.asarray(times, dtype="datetime64[s]"))
+        qty = np.atleast_1d(np.asarray(qty, dtype=np.int64))
+        self.chunks.append((slots, times, qty))
+
+        for buckets, unit in ((self.daily, "D"), (self.monthly, "M")):
+            keys = times.astype(f"datetime64[{unit}]")
+            order = np.argsort(keys, kind="stable")
+            uniq, starts = np.unique(keys[order], return_index=True)
+            for key, part in zip(uniq, np.split(order, starts[1:])):
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = np.zeros(self.n_slots, dtype=np.int64)
+                np.add.at(bucket, slots[part], qty[part])
+
+    def events(self):
+        if not self.chunks:
+            return (np.empty(0, dtype=np.int64), np.empty(0, dtype="datetime64[s]"),
+                    np.empty(0, dtype=np.int64))
+        return tuple(np.concatenate(col) for col in zip(*self.chunks))
+
+    def days(self, end, n=7):
+        # (labels, (n_slots, n)) net movement of the n days ending at end
+        keys = np.datetime64(end, "D") - np.arange(n - 1, -1, -1)
+        zeros = np.zeros(self.n_slots, dtype=np.int64)
+        series = np.column_stack([self.daily.get(key, zeros) for key in keys])
+        labels = [WEEKDAYS[(key.astype(int) - 4) % 7] for key in keys]   # 1970-01-01 was a Thursday
+        return labels, series
+
+    def months(self, year):
+        # (labels, (n_slots, 12)) net movement of each month of year
+        keys = np.datetime64(f"{year}-01", "M") + np.arange(12)
+        zeros = np.zeros(self.n_slots, dtype=np.int64)
+        return MONTHS, np.column_stack([self.monthly.get(key, zeros) for key in keys])
+
+    def rollup_array(self, unit):
+        # (first bucket, (n_buckets, n_slots)) dense copy of the "D" or "M"
+        # buckets, zero-filled between the first and last one, for storage
+        buckets = self.daily if unit == "D" else self.monthly
+        if not buckets:
+            return None, np.zeros((0, self.n_slots), dtype=np.int64)
+        keys = sorted(buckets)
+        array = np.zeros(((keys[-1] - keys[0]).astype(int) + 1, self.n_slots), dtype=np.int64)
+        for key in keys:
+            array[(key - keys[0]).astype(int)] = buckets[key]
+        return keys[0], array
+
+    @classmethod
+    def from_rollups(cls, n_slots, rollups):
+        # a log rebuilt from stored rollup arrays, {"D"|"M": (first bucket, array)};
+        # the raw events stay with the source, only the buckets the charts read are loaded
+        log = cls(n_slots)
+        for unit, (start, array) in rollups.items():
+            if start is None:
+                continue
+            buckets = log.daily if unit == "D" else log.monthly
+            array = np.array(array, dtype=np.int64).reshape(-1, n_slots)
+            first = np.datetime64(start, unit)
+            for i in np.flatnonzero(array.any(axis=1)):
+                buckets[first + i] = array[i]
+        return log
+
+    @classmethod
+    def random(cls, n_slots, end, days=400, rate=0.5, rng=None):
+        # fake history: on each day each slot moves stock with probability rate
+        rng = np.random.default_rng() if rng is None else rng
+        slot, day = np.nonzero(rng.random((n_slots, days)) < rate)
+        times = (np.datetime64(end, "D") - (days - 1) + day).astype("datetime64[s]")
+        times = times + rng.integers(0, 86400, len(times)).astype("timedelta64[s]")
+        log = cls(n_slots)
+        log.record(slot, times, rng.integers(-5000, 5000, len(slot)))
+        return log
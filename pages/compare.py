@@ -0,0 +1,59 @@
+import altair as alt
+import streamlit as st
+
+from caching import cached, STATIC_TTL
+from dashboard import SITES, load_history_store, site_names
+from instrumentation import begin_run, end_run, span
+
+FIELDS = {"temperature": "溫度", "humidity": "濕度"}
+STATS = ["mean", "min", "max", "p95"]
+
+@cached(ttl=STATIC_TTL, max_entries=16)
+def load_daily_stats(field):
+    # one groupby over every warehouse, shared by all sessions
+    return load_history_store().daily_stats(field)
+
+@cached(ttl=STATIC_TTL, max_entries=16)
+def load_window_stats(field):
+    return load_history_store().window_stats(field)
+
+def get_band_chart(stats, field, title):
+    # data sits on the layer so the same spec can be faceted into small multiples
+    base = alt.Chart().encode(x=alt.X("date:T", title="date"))
+    band = base.mark_area(opacity=0.2).encode(y=alt.Y("min:Q", title=field), y2="max:Q", color="site:N")
+    mean = base.mark_line().encode(y="mean:Q", color="site:N")
+    p95 = base.mark_line(strokeDash=[4, 2], opacity=0.6).encode(y="p95:Q", color="site:N")
+    return alt.layer(band, mean, p95, data=stats, title=title or "")
+
+begin_run()
+st.header("倉庫比較")
+st.write("##### 各倉每日平均 / 最小 / 最大 / p95")
+
+field = st.radio(" ", list(FIELDS), format_func=FIELDS.get, horizontal=True, label_visibility="collapsed",
+                 key="compare_field")
+layout = st.radio("顯示方式", ["疊加", "分圖"], horizontal=True, key="compare_layout")
+all_sites = site_names()
+sites = st.multiselect("倉庫", all_sites, default=all_sites[:len(SITES)], key="compare_sites")
+
+stats = load_daily_stats(field)
+stats = stats[stats.site.isin(sites)]
+if stats.empty:
+    st.info("請至少選擇一個倉庫")
+    end_run()
+    st.stop()
+
+if layout == "疊加":
+    chart = get_band_chart(stats, field, FIELDS[field]).interactive()
+    with span("band_chart", payload=chart):
+        st.altair_chart(chart, use_container_width=True)
+else:
+    chart = get_band_chart(stats, field, None).properties(width=220, height=150).facet(
+        facet=alt.Facet("site:N", title=None), columns=4)
+    with span("band_chart", payload=chart):
+        st.altair_chart(chart)
+
+## the summary is over every reading in the history, so p95 is the window's p95
+summary = load_window_stats(field)
+st.dataframe(summary[summary.index.isin(sites)][STATS], use_container_width=True)
+
+end_run()
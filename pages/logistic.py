@@ -1,45 +1,138 @@
-import numpy as np
-import pandas as pd
+import os
 import pydeck as pdk
 import streamlit as st
 
+from caching import cached, STATIC_TTL
+from instrumentation import begin_run, end_run, fragment, span
+from live_positions import FEED_PATH, REFRESH_SECONDS, LivePositions
+from routes import RouteStore, viewport_bbox
+from shipments import ShipmentTable, page_count
+from simplify import LOD_ZOOMS, lod_level, zoom_tolerance
+
+ROUTES_PATH = 'route3.json'
+## env var pointing at a routes/ directory written by synthetic.py or ingest_routes.py
+ROUTES_ENV = "TS_DASHBOARD_ROUTES"
+ROUTES_DIR = os.environ.get(ROUTES_ENV, 'route3.routes')  # python ingest_routes.py route3.json route3.routes
+SHIPMENTS_PATH = 'shipments.csv'  # 貨物編號,出貨時間,貨物狀態
+
+@cached(ttl=STATIC_TTL)
+def load_routes():
+    # memory-map the ingested columnar routes when present, else parse the json once
+    if os.path.isdir(ROUTES_DIR):
+        return RouteStore.load(ROUTES_DIR)
+    return RouteStore.from_json(ROUTES_PATH)
+
+@cached(ttl=STATIC_TTL, max_entries=len(LOD_ZOOMS))
+def load_route_lod(level):
+    # simplified copy for one zoom level: memory-mapped when ingested, else
+    # simplified here on first use of that level only
+    routes = load_routes()
+    lod = routes.load_lod(ROUTES_DIR, level) if os.path.isdir(ROUTES_DIR) else None
+    return routes.simplified(zoom_tolerance(level)) if lod is None else lod
+
+@cached(ttl=STATIC_TTL)
+def load_shipments():
+    # tracking export when present, else one in-transit row per routed shipment
+    if os.path.isfile(SHIPMENTS_PATH):
+        return ShipmentTable.from_csv(SHIPMENTS_PATH)
+    return ShipmentTable.from_routes(load_routes())
+
+@cached(ttl=STATIC_TTL, max_entries=64)
+def load_route_frame(rows, zoom):
+    # pydeck records of the given routes at the level of detail for zoom
+    level = lod_level(zoom)
+    routes = load_routes() if level is None else load_route_lod(level)
+    return routes.to_frame(list(rows))
+
+@cached(ttl=STATIC_TTL)
+def get_live_positions():
+    return LivePositions(FEED_PATH)
+
+@fragment("live_map_section", run_every=REFRESH_SECONDS)
+def live_map(layer, view_state):
+    # only this map reruns on each refresh, and the whole deck is re-sent each
+    # time, so it carries the positions plus at most the confirmed shipments' paths
+    with span("live_positions"):
+        positions = get_live_positions().poll()
+    position_layer = pdk.Layer(
+        type='ScatterplotLayer',
+        data=positions,
+        pickable=True,
+        get_position=['lon', 'lat'],
+        get_fill_color=[255, 255, 255],
+        get_line_color=[0, 0, 0],
+        stroked=True,
+        radius_min_pixels=5,
+    )
+    layers = [position_layer] if layer is None else [layer, position_layer]
+    deck = pdk.Deck(layers=layers, initial_view_state=view_state, tooltip={"style":{"color":"white"}})
+    with span("live_map", payload=deck):
+        st.pydeck_chart(deck)
+    st.caption(f"{len(positions)} 台車輛即時位置")
+
+def show_all_shipments():
+    # runs before the rerun, so the status table and the map both drop the selection
+    st.session_state.pop("shipments", None)
+
+begin_run()
+shipment_table = load_shipments()
 with st.sidebar.form(key="my_form"):
-    selectbox_state = st.selectbox("請輸入您想查詢的貨物編號", ['BNA05201624', 'BNA17160650', 'BNA28408227', 'PNA07065293', 'PNA13696387', 'PNA24590925', 'GRP07979783', 'GRP13478514', 'GRP27732412'])
+    selectbox_state = st.multiselect("請輸入您想查詢的貨物編號", shipment_table.ids)
     pressed = st.form_submit_button("確認")
 st.header("出貨狀況")
-def show_table(number):
-    df = pd.DataFrame(np.array([[number, '2023/1/11 10:34:45', '運送中']]), columns=(['貨物編號', '出貨時間', '貨物狀態']))
-    st.table(df)
+def show_table(numbers):
+    pages = page_count(len(numbers))
+    page = st.number_input("頁數", 1, pages, 1) if pages > 1 else 1
+    st.table(shipment_table.page(numbers, page))
 
 if pressed:
-    show_table(number = selectbox_state)
+    st.session_state["shipments"] = selectbox_state
+if st.session_state.get("shipments"):
+    show_table(numbers = st.session_state["shipments"])
 
-df = pd.read_json('route3.json')
+## map viewport; only routes inside it (or the confirmed shipment) are sent to the browser
+with st.sidebar.expander("地圖範圍"):
+    latitude = st.number_input("緯度", value=23.5, format="%.4f", key="map_latitude")
+    longitude = st.number_input("經度", value=120.8984867, format="%.4f", key="map_longitude")
+    zoom = st.slider("縮放", 3, 15, 6, key="map_zoom")
+    st.button("顯示所有貨物", on_click=show_all_shipments)
+
+routes = load_routes()
+shipments = st.session_state.get("shipments")
+if shipments:
+    rows = routes.rows(shipments)
+else:
+    with span("route_query"):
+        rows = routes.query_bbox(*viewport_bbox(latitude, longitude, zoom))
+df = load_route_frame(tuple(rows), zoom)
 st.header("貨物位置")
 st.dataframe(df)
 
-def hex_to_rgb(h):
-    h = h.lstrip('#')
-    return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
-
-df['顏色'] = df['顏色'].apply(hex_to_rgb)
 view_state = pdk.ViewState(
-    latitude=23.5,
-    longitude=120.8984867,
-    zoom=6
+    latitude=latitude,
+    longitude=longitude,
+    zoom=zoom
 )
 
-layer = pdk.Layer(
-    type='PathLayer',
-    data=df,
-    pickable=True,
-    get_color='顏色',
-    width_scale=20,
-    width_min_pixels=2,
-    get_path='路徑',
-    get_width=5
-)
+with span("route_layer"):
+    layer = pdk.Layer(
+        type='PathLayer',
+        data=df,
+        pickable=True,
+        get_color='顏色',
+        width_scale=20,
+        width_min_pixels=2,
+        get_path='路徑',
+        get_width=5
+    )
 
-r = pdk.Deck(layers=[layer], initial_view_state=view_state, tooltip={"style":{"color":"white"}})
+if st.sidebar.toggle("即時位置", key="live_toggle"):
+    if not shipments:
+        st.caption("即時模式只顯示已確認貨物的路線；請在側欄選擇貨物編號")
+    live_map(layer if shipments else None, view_state)
+else:
+    r = pdk.Deck(layers=[layer], initial_view_state=view_state, tooltip={"style":{"color":"white"}})
+    with span("route_map", payload=r):
+        st.pydeck_chart(r)
 
-st.pydeck_chart(r)
\ No newline at end of file
+end_run()
@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import deque
+
+import streamlit as st
+
+from instrumentation import fragment, span
+
+REFRESH_SECONDS = 5
+WINDOW_SIZE = 120        # samples kept per site, 10 minutes at 5s
+
+## metric key, label, value format
+METRICS = [
+    ("temperature", "溫度", "{} °C"),
+    ("humidity", "濕度", "{} %"),
+    ("inventory_days", "庫存週轉天數", "{} days"),
+    ("correct_rate", "進/出貨準確率", "{} %"),
+]
+
+class MetricFeed:
+    # rolling window of the latest readings per site, shared by all sessions
+    # so that each refresh reads at most one new sample per site
+
+    def __init__(self, read, window_size=WINDOW_SIZE, interval=REFRESH_SECONDS):
+        self.read = read
+        self.window_size = window_size
+        self.interval = interval
+        self.windows = {}
+        self.locks = {}
+        self.lock = threading.Lock()
+
+    def _site_lock(self, site):
+        # one lock per site, so a slow read only holds up sessions polling that site
+        with self.lock:
+            if site not in self.locks:
+                self.locks[site] = threading.Lock()
+                self.windows[site] = deque(maxlen=self.window_size)
+            return self.locks[site]
+
+    def _due(self, site):
+        window = self.windows[site]
+        return not window or time.time() - window[-1][0] >= self.interval
+
+    def offer(self, site, reading):
+        # seed an empty window with a reading fetched elsewhere; after that poll
+        # is the only writer, so an older cached reading never lands behind newer samples
+        with self._site_lock(site):
+            window = self.windows[site]
+            if not window and reading is not None:
+                window.append((time.time(), reading))
+
+    def poll(self, site):
+        with self._site_lock(site):
+            if self._due(site):
+                window = self.windows[site]
+                previous = window[-1][1] if window else None
+                with span("fetch_realtime"):
+                    reading = self.read(site, previous)
+                if reading is not None:
+                    window.append((time.time(), reading))
+            return self.snapshot(site)
+
+    def snapshot(self, site):
+        # latest reading and its change since the previous sample
+        window = self.windows.get(site)
+        if not window:
+            return None, None
+        latest = window[-1][1]
+        previous = window[-2][1] if len(window) > 1 else latest
+        delta = {key: latest[key] - previous[key] for key in latest}
+        return latest, delta
+
+
+@fragment("metrics_panel", run_every=REFRESH_SECONDS)
+def metrics_panel(feed, site):
+    # reruns on its own every REFRESH_SECONDS without rerunning the page
+    latest, delta = feed.poll(site)
+    if latest is None:
+        st.info(f"{site} 尚無即時資料")
+        return
+    for col, (key, label, frmt) in zip(st.columns(len(METRICS)), METRICS):
+        col.metric(label, frmt.format(latest[key]), frmt.format(delta[key]))
@@ -0,0 +1,141 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+
+from simplify import LOD_ZOOMS, simplify_paths, zoom_tolerance
+
+ID_COL = "貨物編號"
+COLOR_COL = "顏色"
+PATH_COL = "路徑"
+
+## columnar on-disk format written by ingest_routes.py, plus bbox.npy and
+## lod<zoom>_coords.npy / lod<zoom>_offsets.npy so loading never scans the coordinates;
+## same flat coords + offsets layout as GeoArrow, kept as .npy so np.load(mmap_mode="r")
+## hands the spatial index and PathLayer frames plain ndarrays with no conversion step
+COLUMNS = ("ids", "colors", "coords", "offsets")
+
+
+def hex_to_rgb(colors):
+    # ['#ed1c24', ...] -> (n, 3) uint8
+    raw = b"".join(bytes.fromhex(h.lstrip('#')) for h in colors)
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+
+
+def viewport_bbox(latitude, longitude, zoom, width_px=1200, height_px=600):
+    # approximate (west, south, east, north) seen by a web-mercator map view
+    deg_per_px = 360 / (256 * 2 ** zoom)
+    half_w = width_px / 2 * deg_per_px
+    half_h = height_px / 2 * deg_per_px * float(np.cos(np.radians(latitude)))
+    return longitude - half_w, latitude - half_h, longitude + half_w, latitude + half_h
+
+
+class RouteStore:
+    # Routes as flat buffers: every vertex of every path in one (m, 2)
+    # lon/lat array, path i spanning coords[offsets[i]:offsets[i + 1]],
+    # colors pre-decoded to (n, 3) RGB and an index from 貨物編號 to row.
+
+    def __init__(self, ids, colors, coords, offsets, bbox=None):
+        self.ids = list(ids)
+        self.colors = colors
+        self.coords = coords
+        self.offsets = offsets
+        self.index = {route_id: i for i, route_id in enumerate(self.ids)}
+        self._build_spatial_index(bbox)
+
+    def _build_spatial_index(self, bbox=None):
+        # per-path bounding boxes, sorted by west edge so a viewport query
+        # only tests paths whose west edge is left of the viewport's east edge;
+        # computing them reads every vertex, so saved ones are passed in instead
+        if bbox is None:
+            starts = self.offsets[:-1]
+            lengths = np.diff(self.offsets)
+            bbox = np.full((len(self.ids), 4), np.nan)
+            nonempty = lengths > 0
+            if nonempty.any():
+                coords = np.asarray(self.coords)
+                at = starts[nonempty]
+                bbox[nonempty, :2] = np.minimum.reduceat(coords, at)
+                bbox[nonempty, 2:] = np.maximum.reduceat(coords, at)
+        self.bbox = bbox    # west, south, east, north
+        self.by_west = np.argsort(bbox[:, 0], kind="stable")
+        self.sorted_west = bbox[self.by_west, 0]
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_records(cls, records):
+        paths = [np.asarray(r[PATH_COL], dtype=np.float64).reshape(-1, 2) for r in records]
+        offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+        np.cumsum([len(p) for p in paths], out=offsets[1:])
+        coords = np.concatenate(paths) if paths else np.empty((0, 2))
+        return cls([r[ID_COL] for r in records], hex_to_rgb([r[COLOR_COL] for r in records]),
+                   coords, offsets)
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_records(json.load(f))
+
+    def save(self, root):
+        os.makedirs(root, exist_ok=True)
+        np.save(os.path.join(root, "ids.npy"), np.asarray(self.ids, dtype=str))
+        np.save(os.path.join(root, "colors.npy"), np.ascontiguousarray(self.colors))
+        np.save(os.path.join(root, "coords.npy"), np.ascontiguousarray(self.coords))
+        np.save(os.path.join(root, "offsets.npy"), self.offsets)
+        np.save(os.path.join(root, "bbox.npy"), self.bbox)
+
+    def save_lods(self, root, levels=LOD_ZOOMS):
+        # Douglas-Peucker copies for each zoom level, computed once at ingest;
+        # they share ids, colors and bboxes with the full store
+        for level in levels:
+            lod = self.simplified(zoom_tolerance(level))
+            np.save(os.path.join(root, f"lod{level}_coords.npy"), np.ascontiguousarray(lod.coords))
+            np.save(os.path.join(root, f"lod{level}_offsets.npy"), lod.offsets)
+
+    @classmethod
+    def load(cls, root, mmap=True):
+        # with mmap the coordinate buffer stays on disk and is paged in on access
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(root, f"{name}.npy"), mmap_mode=mode) for name in COLUMNS}
+        bbox_path = os.path.join(root, "bbox.npy")
+        bbox = np.load(bbox_path) if os.path.isfile(bbox_path) else None
+        return cls(arrays["ids"].tolist(), arrays["colors"], arrays["coords"], arrays["offsets"], bbox)
+
+    def load_lod(self, root, level, mmap=True):
+        # the saved simplified copy for a zoom level, or None if it wasn't ingested
+        coords_path = os.path.join(root, f"lod{level}_coords.npy")
+        if not os.path.isfile(coords_path):
+            return None
+        mode = "r" if mmap else None
+        offsets = np.load(os.path.join(root, f"lod{level}_offsets.npy"), mmap_mode=mode)
+        return RouteStore(self.ids, self.colors, np.load(coords_path, mmap_mode=mode), offsets, self.bbox)
+
+    def simplified(self, tolerance):
+        # same routes with Douglas-Peucker simplified paths; simplifying only
+        # drops vertices, so the full paths' bboxes still bound them
+        coords, offsets = simplify_paths(self.coords, self.offsets, tolerance)
+        return RouteStore(self.ids, self.colors, coords, offsets, self.bbox)
+
+    def rows(self, ids):
+        return [self.index[route_id] for route_id in ids if route_id in self.index]
+
+    def query_bbox(self, west, south, east, north):
+        # rows of every path whose bounding box intersects the viewport
+        candidates = self.by_west[:np.searchsorted(self.sorted_west, east, "right")]
+        bbox = self.bbox[candidates]
+        hit = (bbox[:, 2] >= west) & (bbox[:, 1] <= north) & (bbox[:, 3] >= south)
+        return np.sort(candidates[hit]).tolist()
+
+    def path(self, row):
+        return self.coords[self.offsets[row]:self.offsets[row + 1]]
+
+    def to_frame(self, rows=None):
+        # pydeck-ready records for the selected rows (all by default)
+        rows = range(len(self)) if rows is None else rows
+        return pd.DataFrame({
+            ID_COL: [self.ids[i] for i in rows],
+            COLOR_COL: [self.colors[i].tolist() for i in rows],
+            PATH_COL: [self.path(i).tolist() for i in rows],
+        })
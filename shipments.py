@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+ID_COL = "貨物編號"
+SHIPPED_COL = "出貨時間"
+STATUS_COL = "貨物狀態"
+PAGE_SIZE = 20
+
+
+class ShipmentTable:
+    # shipment status table indexed by 貨物編號 for O(1) single and batch lookup
+
+    def __init__(self, df):
+        self.df = df.set_index(ID_COL, drop=False).sort_index()
+
+    @property
+    def ids(self):
+        return self.df.index.tolist()
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls(pd.read_csv(path, dtype=str))
+
+    @classmethod
+    def from_routes(cls, routes, shipped='2023/1/11 10:34:45', status='運送中'):
+        # until a tracking export is available every routed shipment is in transit
+        n = len(routes)
+        return cls(pd.DataFrame({
+            ID_COL: routes.ids,
+            SHIPPED_COL: np.full(n, shipped, dtype=object),
+            STATUS_COL: np.full(n, status, dtype=object),
+        }))
+
+    def lookup(self, ids):
+        # unknown IDs are dropped, order follows ids
+        ids = pd.Index(ids)
+        return self.df.loc[ids[ids.isin(self.df.index)]].reset_index(drop=True)
+
+    def page(self, ids, page, page_size=PAGE_SIZE):
+        # page is 1-based
+        start = (page - 1) * page_size
+        return self.lookup(list(ids)[start:start + page_size])
+
+
+def page_count(n, page_size=PAGE_SIZE):
+    return max(1, -(-n // page_size))
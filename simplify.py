@@ -0,0 +1,61 @@
+import numpy as np
+
+## zoom levels with a precomputed simplified copy of every route
+LOD_ZOOMS = (4, 6, 8, 10, 12)
+
+
+def zoom_tolerance(zoom):
+    # half a 256px-tile pixel in degrees: vertices closer than that collapse
+    return 360 / (256 * 2 ** zoom) / 2
+
+
+def douglas_peucker(points, tolerance):
+    # mask of the vertices kept; each split's distances are computed vectorized
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    if n < 3:
+        keep[:] = True
+        return keep
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        if hi - lo < 2:
+            continue
+        start, end = points[lo], points[hi]
+        seg = end - start
+        inner = points[lo + 1:hi] - start
+        norm = np.hypot(*seg)
+        if norm == 0:
+            dist = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            dist = np.abs(seg[0] * inner[:, 1] - seg[1] * inner[:, 0]) / norm
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            mid = lo + 1 + i
+            keep[mid] = True
+            stack.append((lo, mid))
+            stack.append((mid, hi))
+    return keep
+
+
+def simplify_paths(coords, offsets, tolerance):
+    # simplify every path of a flat (coords, offsets) buffer
+    coords = np.asarray(coords)
+    keep = np.zeros(len(coords), dtype=bool)
+    for lo, hi in zip(offsets[:-1], offsets[1:]):
+        keep[lo:hi] = douglas_peucker(coords[lo:hi], tolerance)
+    kept_before = np.concatenate([[0], np.cumsum(keep)])
+    return coords[keep], kept_before[offsets]
+
+
+def lod_level(zoom, levels=LOD_ZOOMS):
+    # coarsest precomputed level that is still detailed enough for zoom;
+    # None means the full-resolution paths
+    levels = [z for z in sorted(levels) if z >= zoom]
+    return levels[0] if levels else None
+
+
+def pick_lod(lods, zoom):
+    level = lod_level(zoom, lods)
+    return None if level is None else lods[level]
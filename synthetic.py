@@ -0,0 +1,122 @@
+import argparse
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from history_store import HistoryStore
+from lot_grid import LotGrid
+from routes import RouteStore
+
+## every fake dataset derives from this seed, so runs are reproducible
+SEED = 9999
+BASE_SITES = ['台北倉', '桃園倉', '高雄倉']
+ROUTE_PREFIXES = ['BNA', 'PNA', 'GRP']
+TAIWAN_BBOX = (120.2, 22.2, 121.8, 25.2)    # west, south, east, north
+
+
+def rng_for(*key, seed=SEED):
+    # independent, reproducible stream per key, e.g. rng_for('storage', site, date)
+    return np.random.default_rng([seed, zlib.crc32(repr(key).encode("utf-8"))])
+
+
+def site_names(n):
+    # the three real warehouses first, then numbered ones
+    return BASE_SITES[:n] + [f"{k:03d}倉" for k in range(len(BASE_SITES), n)]
+
+
+def history_store(sites, n_readings, end=None, freq="h", seed=SEED):
+    # (sites x readings) temperature/humidity in one draw per field
+    end = pd.Timestamp.now().floor(freq) if end is None else pd.Timestamp(end)
+    dates = pd.date_range(end=end, periods=n_readings, freq=freq)
+    rng = rng_for("history", seed=seed)
+    temperature = np.round(rng.uniform(15, 25, (len(sites), n_readings)), 1)
+    humidity = np.round(rng.uniform(15, 40, (len(sites), n_readings)), 1)
+
+    store = HistoryStore()
+    for n, site in enumerate(sites):
+        store.append(site, dates, temperature=temperature[n], humidity=humidity[n])
+    return store
+
+
+## (low, high) of each realtime reading
+REALTIME_RANGES = {
+    "temperature": (15, 25),
+    "humidity": (15, 25),
+    "inventory_days": (5, 15),
+    "correct_rate": (95, 100),
+}
+
+
+def realtime_reading(rng, previous=None):
+    # a bounded random walk from the previous reading
+    low, high = np.array(list(REALTIME_RANGES.values())).T
+    if previous is None:
+        values = rng.integers(low, high + 1)
+    else:
+        values = np.array([previous[key] for key in REALTIME_RANGES]) + rng.integers(-1, 2, len(low))
+        values = np.clip(values, low, high)
+    return dict(zip(REALTIME_RANGES, values.tolist()))
+
+
+def storage_split(rng):
+    return rng.integers(50, 201, 4).tolist()
+
+
+def inventory_split(rng):
+    return rng.integers(100, 501, 5).tolist()
+
+
+def lot_grid(rng, n_zones=5, n_slots=6, today=None):
+    return LotGrid.random(n_zones, n_slots, rng=rng, today=today)
+
+
+def route_store(n_routes, n_points=25, seed=SEED):
+    # random-walk routes inside Taiwan; the geometry is drawn in one batch
+    rng = rng_for("routes", seed=seed)
+    west, south, east, north = TAIWAN_BBOX
+    start = rng.uniform((west, south), (east, north), (n_routes, 1, 2))
+    steps = rng.normal(0, 0.02, (n_routes, n_points - 1, 2))
+    paths = np.concatenate([start, start + np.cumsum(steps, axis=1)], axis=1)
+    numbers = rng.integers(0, 10 ** 8, n_routes)
+    ids = [f"{ROUTE_PREFIXES[n % len(ROUTE_PREFIXES)]}{number:08d}" for n, number in enumerate(numbers)]
+    return RouteStore(
+        ids,
+        rng.integers(0, 256, (n_routes, 3), dtype=np.uint8),
+        paths.reshape(-1, 2),
+        np.arange(0, (n_routes + 1) * n_points, n_points, dtype=np.int64),
+    )
+
+
+def main(argv=None):
+    # writes a production-scale dataset in the formats the dashboard loads
+    parser = argparse.ArgumentParser(description="Generate reproducible synthetic dashboard data.")
+    parser.add_argument("out", help="output directory")
+    parser.add_argument("--sites", type=int, default=50)
+    parser.add_argument("--zones", type=int, default=20)
+    parser.add_argument("--slots", type=int, default=100)
+    parser.add_argument("--readings", type=int, default=366 * 24, help="hourly readings per site")
+    parser.add_argument("--routes", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=SEED)
+    args = parser.parse_args(argv)
+
+    from datasource import SQLiteDataSource, SyntheticDataSource
+
+    sites = site_names(args.sites)
+    history_store(sites, args.readings, seed=args.seed).save(os.path.join(args.out, "history"))
+    routes = route_store(args.routes, seed=args.seed)
+    routes.save(os.path.join(args.out, "routes"))
+    routes.save_lods(os.path.join(args.out, "routes"))
+    source = SyntheticDataSource(args.zones, args.slots, seed=args.seed)
+    SQLiteDataSource.from_source(os.path.join(args.out, "dashboard.db"), source, sites,
+                                 [pd.Timestamp.now().date()])
+    print(f"{args.sites} sites x {args.zones * args.slots} slots x {args.readings} readings, "
+          f"{args.routes} routes -> {args.out}")
+    print(f"serve it with TS_DASHBOARD_HISTORY={os.path.join(args.out, 'history')} "
+          f"TS_DASHBOARD_ROUTES={os.path.join(args.out, 'routes')} "
+          f"TS_DASHBOARD_DB={os.path.join(args.out, 'dashboard.db')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+from streamlit.testing.v1 import AppTest
+
+
+def script():
+    import streamlit as st
+    from caching import cache_stats, cached
+
+    @cached(max_entries=2)
+    def square(x):
+        st.session_state.setdefault("calls", []).append(x)
+        return [x * x]
+
+    @cached(copy=True)
+    def items():
+        return [1, 2]
+
+    st.session_state["values"] = [square(2), square(2), square(3), square(2)]
+    st.session_state["same"] = square(2) is square(2)
+    st.session_state["stats"] = cache_stats()[square.__qualname__]
+    items().append(3)
+    st.session_state["copy"] = items()
+
+
+def test_hits_and_misses_are_counted():
+    at = AppTest.from_function(script).run()
+    assert not at.exception
+    assert at.session_state["values"] == [[4], [4], [9], [4]]
+    assert at.session_state["calls"] == [2, 3]
+    assert at.session_state["same"]
+    assert at.session_state["stats"] == {"hits": 4, "misses": 2}
+    assert at.session_state["copy"] == [1, 2]
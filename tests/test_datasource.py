@@ -0,0 +1,53 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from datasource import DataSource, SQLiteDataSource, SyntheticDataSource, load_dashboard_data, load_lots
+
+DAY = datetime.date(2024, 5, 1)
+
+
+def test_data_source_is_abstract():
+    with pytest.raises(TypeError):
+        DataSource()
+
+
+def test_synthetic_is_reproducible():
+    a = load_dashboard_data(SyntheticDataSource(seed=1), "s", DAY)
+    b = load_dashboard_data(SyntheticDataSource(seed=1), "s", DAY)
+    assert a["storage"] == b["storage"] and a["inventory"] == b["inventory"]
+    assert load_lots(SyntheticDataSource(seed=1), "s").lots.equals(
+        load_lots(SyntheticDataSource(seed=1), "s").lots)
+
+
+def test_sqlite_roundtrip(tmp_path):
+    source = SyntheticDataSource(n_zones=2, n_slots=3)
+    db = SQLiteDataSource.from_source(str(tmp_path / "d.db"), source, ["s"], [DAY])
+    want = load_dashboard_data(source, "s", DAY)
+    got = load_dashboard_data(db, "s", DAY)
+    assert got["storage"] == want["storage"]
+    assert got["inventory"] == want["inventory"]
+    got_lots, want_lots = load_lots(db, "s"), load_lots(source, "s")
+    assert got_lots.lots.equals(want_lots.lots)
+    today = datetime.date.today()
+    assert got_lots.day_series([1], today)[1].any()
+    assert np.array_equal(got_lots.day_series([1], today)[1], want_lots.day_series([1], today)[1])
+    assert np.array_equal(got_lots.month_series([0, 5], today.year)[1], want_lots.month_series([0, 5], today.year)[1])
+    assert set(got["realtime"]) == set(want["realtime"])
+
+
+def test_sqlite_falls_back_to_nearest_snapshot(tmp_path):
+    db = SQLiteDataSource(str(tmp_path / "d.db"))
+    db.write("s", datetime.date(2024, 5, 1), storage=[1])
+    db.write("s", datetime.date(2024, 5, 10), storage=[2])
+    fetch = lambda date: load_dashboard_data(db, "s", date)["storage"]
+    assert fetch(datetime.date(2024, 5, 5)) == [1]
+    assert fetch(datetime.date(2024, 5, 20)) == [2]
+    assert fetch(datetime.date(2024, 4, 1)) == [1]
+    assert load_dashboard_data(db, "other", DAY)["storage"] is None
+
+
+def test_from_source_without_dates(tmp_path):
+    db = SQLiteDataSource.from_source(str(tmp_path / "d.db"), SyntheticDataSource(), ["s"], [])
+    assert load_lots(db, "s") is not None
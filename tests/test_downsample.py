@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from downsample import downsample, lttb, min_max
+
+
+def test_lttb_keeps_endpoints_and_size():
+    x = np.arange(1000)
+    y = np.sin(x / 50)
+    idx = lttb(x, y, 100)
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == 999
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_keeps_spike():
+    y = np.zeros(1000)
+    y[437] = 100
+    assert 437 in lttb(np.arange(1000), y, 50)
+
+
+def test_lttb_short_series_untouched():
+    assert lttb(np.arange(5), np.arange(5), 10).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_min_max_keeps_extremes():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=1000)
+    idx = min_max(np.arange(1000), y, 100)
+    assert len(idx) <= 100
+    assert np.argmin(y) in idx and np.argmax(y) in idx
+
+
+def test_downsample_per_site_with_dates():
+    dates = pd.date_range("2024-01-01", periods=500, freq="h")
+    data = pd.DataFrame({
+        "site": np.repeat(["a", "b"], 500),
+        "date": np.tile(dates, 2),
+        "temperature": np.arange(1000, dtype=float),
+    })
+    out = downsample(data, "date", "temperature", 50)
+    assert out.groupby("site").size().tolist() == [50, 50]
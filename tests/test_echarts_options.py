@@ -0,0 +1,22 @@
+import json
+
+from echarts_options import PIE_TEMPLATES, pie_options
+
+
+def test_pie_data_is_numeric_and_labelled():
+    option = pie_options("storage", (10, 20.5, 69.5))
+    assert option["series"][0]["data"] == [{"value": 10, "name": "Empty"},
+                                           {"value": 20.5, "name": "Reserved"},
+                                           {"value": 69.5, "name": "Occupied"}]
+    assert option["title"] == PIE_TEMPLATES["storage"]["title"]
+    json.dumps(option)
+
+
+def test_same_values_reuse_the_option():
+    assert pie_options("inventory", (1, 2, 3, 4)) is pie_options("inventory", (1, 2, 3, 4))
+    assert pie_options("inventory", (1, 2, 3, 5)) is not pie_options("inventory", (1, 2, 3, 4))
+
+
+def test_template_is_not_modified():
+    pie_options("storage", (1, 2, 3))
+    assert "data" not in PIE_TEMPLATES["storage"]["series"][0]
@@ -0,0 +1,39 @@
+import numpy as np
+
+from heatmap import aggregate, heatmap_cells, heatmap_option, tile_factors, tile_labels
+
+
+def test_tile_factors():
+    assert tile_factors(5, 6) == (1, 1)
+    fy, fx = tile_factors(40, 250, max_cells=600)
+    assert -(-40 // fy) * -(-250 // fx) <= 600
+    assert tile_factors(1000, 1, max_cells=10) == (100, 1)
+
+
+def test_aggregate_ignores_edge_padding():
+    matrix = np.arange(15, dtype=float).reshape(3, 5)
+    tiles = aggregate(matrix, 2, 2)
+    assert tiles.shape == (2, 3)
+    assert tiles[0, 0] == np.mean([0, 1, 5, 6])
+    assert tiles[1, 2] == 14
+
+
+def test_tile_labels():
+    assert tile_labels(["A", "B", "C"], 1) == ["A", "B", "C"]
+    assert tile_labels(["01", "02", "03", "04", "05"], 2) == ["01-02", "03-04", "05-05"]
+
+
+def test_cells_drop_empty_slots():
+    assert heatmap_cells(np.array([[0, 3.6], [7, 0]])) == [[1, 0, 4], [0, 1, 7]]
+
+
+def test_option_tiles_large_grids():
+    small = heatmap_option(np.ones((5, 6)), list("ABCDE"), list("123456"))
+    assert small["series"][0]["label"]["show"]
+    assert len(small["series"][0]["data"]) == 30
+
+    option = heatmap_option(np.ones((40, 250)), [str(i) for i in range(40)], [str(i) for i in range(250)])
+    data = option["series"][0]["data"]
+    assert len(data) <= 600
+    assert len(option["xAxis"]["data"]) * len(option["yAxis"]["data"]) == len(data)
+    assert not option["series"][0]["label"]["show"]
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from history_store import HistoryStore
+
+
+def make_store(hours=24 * 60):
+    dates = pd.date_range("2024-01-01", periods=hours, freq="h")
+    store = HistoryStore()
+    store.append("a", dates, temperature=np.arange(hours, dtype=float))
+    return store, dates
+
+
+def test_append_merges_sorted():
+    store, dates = make_store(10)
+    store.append("a", dates[:2] - pd.Timedelta(hours=5), temperature=[-1.0, -2.0], humidity=[5.0, 6.0])
+    part = store.partitions["a"]
+    assert np.all(np.diff(part["date"]) > np.timedelta64(0))
+    assert np.isnan(part["humidity"][2:]).all()
+
+
+def test_slice_window():
+    store, dates = make_store()
+    data = store.slice("a", "temperature", dates[10], dates[20])
+    assert len(data) == 11
+    assert data["temperature"].tolist() == list(range(10, 21))
+
+
+def test_save_load_roundtrip(tmp_path):
+    store, dates = make_store()
+    store.save(tmp_path)
+    loaded = HistoryStore.load(tmp_path)
+    assert loaded.sites() == ["a"]
+    pd.testing.assert_frame_equal(loaded.slice("a", "temperature", dates[3], dates[9]),
+                                  store.slice("a", "temperature", dates[3], dates[9]))
+
+
+def test_save_replaces_previous_store(tmp_path):
+    store, dates = make_store(10)
+    store.append("b", dates, temperature=np.zeros(10))
+    store.save(tmp_path)
+    smaller, _ = make_store(10)
+    smaller.save(tmp_path)
+    assert HistoryStore.load(tmp_path).sites() == ["a"]
+
+
+def test_daily_stats():
+    store, _ = make_store(48)
+    stats = store.daily_stats("temperature")
+    assert stats[["mean", "min", "max"]].values.tolist() == [[11.5, 0, 23], [35.5, 24, 47]]
+    assert stats.columns.tolist() == ["site", "date", "mean", "min", "max", "p95"]
+    assert store.daily_stats("temperature", sites=[]).empty
+
+
+def test_window_stats():
+    store, _ = make_store(48)
+    stats = store.window_stats("temperature")
+    assert stats.loc["a", ["mean", "min", "max"]].tolist() == [23.5, 0, 47]
+    assert stats.loc["a", "p95"] == np.percentile(np.arange(48), 95)
+    assert store.window_stats("temperature", sites=[]).empty
+
+
+def test_raw_query_window():
+    store, dates = make_store()
+    data = store.query("a", "temperature", dates[10], dates[20])
+    assert len(data) == 11
+    assert data["temperature"].tolist() == list(range(10, 21))
+
+
+def test_day_rollup_matches_raw():
+    store, dates = make_store()
+    data = store.query("a", "temperature", dates[0], dates[-1], resolution="day")
+    assert len(data) == 60
+    assert data["temperature"].iloc[0] == np.mean(np.arange(24)).round(1)
+    assert data["min"].iloc[1] == 24 and data["max"].iloc[1] == 47
+
+
+def test_resolution_keeps_rows_bounded():
+    store, dates = make_store(24 * 400)
+    assert store.resolution("a", dates[0], dates[100]) == "raw"
+    assert store.resolution("a", dates[0], dates[-1]) == "day"
+
+
+def test_append_invalidates_rollups():
+    store, dates = make_store()
+    store.rollup("a", "temperature", "day")
+    store.append("a", dates[-1:] + pd.Timedelta(days=1), temperature=[1000.0])
+    data = store.query("a", "temperature", resolution="day")
+    assert data["max"].iloc[-1] == 1000
@@ -0,0 +1,75 @@
+import altair as alt
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import instrumentation
+from instrumentation import SECTION_STATS, payload_size, prometheus_text, span
+
+
+@pytest.fixture
+def context():
+    SECTION_STATS.clear()
+    ctx = instrumentation._context
+    ctx.enabled, ctx.spans, ctx.site, ctx.action = True, [], "台北倉", "load"
+    yield ctx
+    del ctx.enabled
+    SECTION_STATS.clear()
+
+
+def test_prometheus_text(context):
+    instrumentation.record("history", 0.5, 100)
+    instrumentation.record("history", 1.5, 20)
+    context.site = 'a"b'
+    instrumentation.record("history", 1.0)
+    text = prometheus_text()
+    assert 'ts_dashboard_section_seconds_sum{section="history",site="台北倉",action="load"} 2.0' in text
+    assert 'ts_dashboard_section_seconds_count{section="history",site="台北倉",action="load"} 2' in text
+    assert 'ts_dashboard_section_max_seconds{section="history",site="台北倉",action="load"} 1.5' in text
+    assert 'ts_dashboard_payload_bytes_total{section="history",site="台北倉",action="load"} 120' in text
+    assert 'site="a\\"b"' in text
+    assert "# TYPE ts_dashboard_cache_hits_total counter" in text
+    assert text.endswith("\n")
+
+
+def test_altair_payload_has_no_row_cap():
+    data = pd.DataFrame({"x": range(20000), "y": range(20000)})
+    chart = alt.layer(alt.Chart().mark_line().encode(x="x", y="y"), alt.Chart().mark_point().encode(x="x"),
+                      data=data)
+    assert payload_size(chart) > 20000
+
+
+def test_span_survives_a_failing_measurement(context):
+    class Broken:
+        def to_json(self):
+            raise ValueError("boom")
+
+    with span("broken", payload=Broken()):
+        pass
+    assert context.spans == [("broken", context.spans[0][1], 0)]
+
+
+def script():
+    import streamlit as st
+    from instrumentation import _context, begin_run
+
+    st.checkbox("a", key="a")
+    st.text_input("b", key="b")
+    with st.form("f"):
+        st.text_input("c", key="c")
+        st.form_submit_button("ok")
+    begin_run("s")
+    st.session_state.setdefault("_actions", []).append(_context.action)
+    st.session_state["_instrumentation_state"] = {
+        key: repr(value) for key, value in st.session_state.items() if not key.startswith("_")}
+
+
+def test_action_is_the_single_triggering_widget():
+    at = AppTest.from_function(script)
+    at.query_params["debug"] = "1"
+    at.run()
+    at.checkbox(key="a").check().run()
+    at.run()
+    at.text_input(key="c").input("typed")
+    at.button[0].click().run()
+    assert at.session_state["_actions"] == ["load", "a", "rerun", "FormSubmitter:f-ok"]
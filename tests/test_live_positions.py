@@ -0,0 +1,21 @@
+from live_positions import FeedTail, PositionBuffer
+
+
+def test_position_ring_buffer():
+    buffer = PositionBuffer(capacity=3)
+    for ts in range(5):
+        buffer.push("A", ts, ts, ts)
+    buffer.push("B", 9, 9, 9)
+    assert buffer.trail("A")[:, 2].tolist() == [2, 3, 4]
+    assert buffer.latest()[["貨物編號", "ts"]].values.tolist() == [["A", 4], ["B", 9]]
+
+
+def test_feed_tail_leaves_partial_line(tmp_path):
+    path = tmp_path / "feed.jsonl"
+    tail = FeedTail(str(path))
+    path.write_text('{"a": 1}\n{"a": ')
+    assert tail.read() == [{"a": 1}]
+    with open(path, "a") as f:
+        f.write('2}\n')
+    assert tail.read() == [{"a": 2}]
+    assert tail.read() == []
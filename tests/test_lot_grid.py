@@ -0,0 +1,62 @@
+import numpy as np
+
+from lot_grid import LotGrid, LotIndex, slot_names, zone_names
+from lot_movements import MovementLog
+
+
+def make_grid(mtrls=("W1", "W12", "W2", "X9"), movements=None):
+    return LotGrid.from_columns(2, 2, list(mtrls), [100, 200, 300, 400],
+                                ["2024-01-01 00:00:00"] * 4, movements or MovementLog(4))
+
+
+def test_names():
+    assert zone_names(28)[-3:] == ["Z", "AA", "AB"]
+    assert slot_names(3) == ["01", "02", "03"]
+    assert slot_names(120)[0] == "001"
+
+
+def test_grid_layout():
+    grid = make_grid()
+    assert grid.slot_ids() == ["A-01", "A-02", "B-01", "B-02"]
+    assert grid.qty_matrix().tolist() == [[100, 200], [300, 400]]
+    assert grid.zone_totals().tolist() == [300, 700]
+    assert grid.lots["remaining"].tolist() == [9900, 9800, 9700, 9600]
+
+
+def test_json_roundtrip():
+    grid = LotGrid.random(3, 4, rng=np.random.default_rng(1), today=np.datetime64("2024-06-01"))
+    loaded = LotGrid.from_json(grid.to_json())
+    assert loaded.shape == (3, 4)
+    assert loaded.lots.equals(grid.lots)
+
+
+def test_index_search():
+    index = LotIndex({"x": make_grid(), "y": make_grid(("Y1", "W12", "Z", "Z"))})
+    assert index.search("a-02") == [("x", 1), ("y", 1)]
+    assert index.search("W12", site="y") == [("y", 1)]
+    assert sorted(index.search("W1")) == [("x", 0)]
+    assert sorted(index.prefix("W1")) == [("x", 0), ("x", 1), ("y", 1)]
+    assert index.prefix("Q") == []
+    assert index.describe(index.search("x9"))["qty"].tolist() == [400]
+
+
+def test_movement_rollups_update_incrementally():
+    grid = make_grid()
+    grid.record_movement([0, 3], ["2024-03-04T10:00:00", "2024-03-05T10:00:00"], [50, -500])
+    grid.record_movement([0], ["2024-03-04T12:00:00"], [-20])
+    labels, series = grid.day_series([0, 3], "2024-03-05", n=2)
+    assert labels == ["Mon", "Tue"]
+    assert series.tolist() == [[30, 0], [0, -500]]
+    assert grid.month_series([0], 2024)[1][0, 2] == 30
+    assert grid.lots["qty"].tolist() == [130, 200, 300, 0]
+
+
+def test_movement_log_rollup_roundtrip():
+    log = MovementLog.random(5, "2024-06-01", days=30, rng=np.random.default_rng(2))
+    start, array = log.rollup_array("D")
+    assert start == np.datetime64("2024-05-03") and array.shape == (30, 5)
+    loaded = MovementLog.from_rollups(5, {unit: log.rollup_array(unit) for unit in ("D", "M")})
+    assert np.array_equal(loaded.days("2024-06-01")[1], log.days("2024-06-01")[1])
+    assert np.array_equal(loaded.months(2024)[1], log.months(2024)[1])
+    loaded.record([0], ["2024-06-01T08:00:00"], [7])
+    assert loaded.days("2024-06-01")[1][0, -1] == log.days("2024-06-01")[1][0, -1] + 7
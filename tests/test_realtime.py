@@ -0,0 +1,60 @@
+import threading
+import time
+
+from realtime import MetricFeed
+
+
+def counter():
+    calls = []
+
+    def read(site, previous):
+        calls.append(site)
+        value = 0 if previous is None else previous["temperature"] + len(calls)
+        return {"temperature": value}
+    return read, calls
+
+
+def test_window_and_delta():
+    read, calls = counter()
+    feed = MetricFeed(read, window_size=3, interval=0)
+    assert feed.poll("a") == ({"temperature": 0}, {"temperature": 0})
+    feed.poll("a")
+    latest, delta = feed.poll("a")
+    assert (latest, delta) == ({"temperature": 5}, {"temperature": 3})
+    feed.poll("a")
+    assert len(feed.windows["a"]) == 3
+
+
+def test_poll_reads_once_per_interval():
+    read, calls = counter()
+    feed = MetricFeed(read, interval=60)
+    feed.offer("a", {"temperature": 10})
+    feed.offer("a", {"temperature": 99})
+    assert feed.poll("a")[0] == {"temperature": 10}
+    assert feed.poll("b")[0] == {"temperature": 0}
+    feed.poll("b")
+    assert calls == ["b"]
+
+
+def test_missing_reading_is_skipped():
+    feed = MetricFeed(lambda site, previous: None, interval=0)
+    assert feed.poll("a") == (None, None)
+
+
+def test_slow_site_does_not_block_others():
+    release = threading.Event()
+
+    def read(site, previous):
+        if site == "slow":
+            release.wait(5)
+        return {"temperature": 1}
+
+    feed = MetricFeed(read)
+    thread = threading.Thread(target=feed.poll, args=("slow",))
+    thread.start()
+    time.sleep(0.05)
+    start = time.perf_counter()
+    assert feed.poll("fast")[0] == {"temperature": 1}
+    assert time.perf_counter() - start < 1
+    release.set()
+    thread.join()
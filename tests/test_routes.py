@@ -0,0 +1,60 @@
+import numpy as np
+
+from routes import RouteStore, hex_to_rgb
+
+
+def make_routes():
+    return RouteStore.from_records([
+        {"貨物編號": "A", "顏色": "#ff0000", "路徑": [[120.0, 22.0], [120.5, 22.5]]},
+        {"貨物編號": "B", "顏色": "#00ff00", "路徑": [[121.0, 24.0], [121.2, 25.0], [121.4, 24.5]]},
+        {"貨物編號": "C", "顏色": "#0000ff", "路徑": [[119.0, 23.0], [122.0, 23.1]]},
+    ])
+
+
+def test_from_records():
+    routes = make_routes()
+    assert routes.offsets.tolist() == [0, 2, 5, 7]
+    assert routes.rows(["C", "missing", "A"]) == [2, 0]
+    assert hex_to_rgb(["#0a0b0c"]).tolist() == [[10, 11, 12]]
+
+
+def test_to_frame():
+    frame = make_routes().to_frame([1])
+    assert frame["貨物編號"].tolist() == ["B"]
+    assert frame["顏色"].tolist() == [[0, 255, 0]]
+    assert len(frame["路徑"].iloc[0]) == 3
+
+
+def test_save_load_roundtrip(tmp_path):
+    routes = make_routes()
+    routes.save(tmp_path)
+    loaded = RouteStore.load(tmp_path)
+    assert loaded.ids == routes.ids
+    assert isinstance(loaded.coords, np.memmap)
+    assert np.array_equal(loaded.path(1), routes.path(1))
+    assert np.array_equal(loaded.colors, routes.colors)
+
+
+def test_query_bbox():
+    routes = make_routes()
+    assert routes.query_bbox(120.1, 22.1, 120.2, 22.2) == [0]
+    assert routes.query_bbox(121.3, 24.9, 121.5, 26.0) == [1]
+    assert routes.query_bbox(120.9, 23.0, 121.1, 24.1) == [1, 2]
+    assert routes.query_bbox(100, 0, 101, 1) == []
+
+
+def test_query_bbox_after_load(tmp_path):
+    make_routes().save(tmp_path)
+    assert RouteStore.load(tmp_path).query_bbox(120.9, 23.0, 121.1, 24.1) == [1, 2]
+
+
+def test_saved_bbox_and_lods(tmp_path):
+    routes = make_routes()
+    routes.save(tmp_path)
+    routes.save_lods(tmp_path, levels=(4,))
+    loaded = RouteStore.load(tmp_path)
+    assert np.array_equal(loaded.bbox, routes.bbox)
+    lod = loaded.load_lod(tmp_path, 4)
+    assert lod.ids == routes.ids
+    assert len(lod.coords) <= len(routes.coords)
+    assert loaded.load_lod(tmp_path, 6) is None
@@ -0,0 +1,29 @@
+import pandas as pd
+
+from shipments import ID_COL, STATUS_COL, ShipmentTable, page_count
+
+
+def make_table():
+    return ShipmentTable(pd.DataFrame({
+        ID_COL: ["C3", "A1", "B2"],
+        "出貨時間": ["t3", "t1", "t2"],
+        STATUS_COL: ["已送達", "運送中", "運送中"],
+    }))
+
+
+def test_lookup_keeps_order_and_drops_unknown():
+    table = make_table()
+    assert table.ids == ["A1", "B2", "C3"]
+    found = table.lookup(["C3", "missing", "A1"])
+    assert found[ID_COL].tolist() == ["C3", "A1"]
+    assert found[STATUS_COL].tolist() == ["已送達", "運送中"]
+    assert table.lookup([]).empty
+
+
+def test_page():
+    table = make_table()
+    ids = table.ids
+    assert table.page(ids, 1, page_size=2)[ID_COL].tolist() == ["A1", "B2"]
+    assert table.page(ids, 2, page_size=2)[ID_COL].tolist() == ["C3"]
+    assert table.page(ids, 3, page_size=2).empty
+    assert [page_count(0), page_count(20), page_count(21)] == [1, 1, 2]
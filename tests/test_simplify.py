@@ -0,0 +1,30 @@
+import numpy as np
+
+from simplify import douglas_peucker, pick_lod, simplify_paths, zoom_tolerance
+
+
+def test_straight_line_collapses_to_endpoints():
+    points = np.column_stack([np.linspace(0, 1, 50), np.linspace(0, 2, 50)])
+    assert douglas_peucker(points, 1e-9).nonzero()[0].tolist() == [0, 49]
+
+
+def test_corner_is_kept():
+    points = np.array([[0, 0], [1, 0], [2, 0], [2, 1], [2, 2]], dtype=float)
+    assert douglas_peucker(points, 0.1).nonzero()[0].tolist() == [0, 2, 4]
+
+
+def test_simplify_paths_offsets():
+    line = np.column_stack([np.arange(10.0), np.zeros(10)])
+    corner = np.array([[0, 0], [1, 0], [2, 0], [2, 1], [2, 2]], dtype=float)
+    coords = np.concatenate([line, corner])
+    simple, offsets = simplify_paths(coords, np.array([0, 10, 15]), 0.1)
+    assert offsets.tolist() == [0, 2, 5]
+    assert simple[2:].tolist() == [[0, 0], [2, 0], [2, 2]]
+
+
+def test_pick_lod():
+    lods = {4: "z4", 8: "z8"}
+    assert pick_lod(lods, 3) == "z4"
+    assert pick_lod(lods, 5) == "z8"
+    assert pick_lod(lods, 9) is None
+    assert zoom_tolerance(5) == zoom_tolerance(4) / 2